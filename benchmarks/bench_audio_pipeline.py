@@ -0,0 +1,140 @@
+"""
+Benchmark do pipeline de áudio: fonte → AudioMonitor (+VAD) → StrikeManager
+
+Passa horas de áudio (arquivos WAV gravados em sala ou o gerador sintético)
+pelo AudioMonitor sem espera (replay acelerado) e pelo
+StrikeManager.processar_barulho com o relógio simulado da gravação. Reporta
+vazão (segundos de áudio por segundo de CPU) e as decisões de strike.
+
+Uso:
+    python benchmarks/bench_audio_pipeline.py gravacao1.wav gravacao2.wav
+    python benchmarks/bench_audio_pipeline.py --sintetico 8 --cenario sala
+"""
+import argparse
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.audio_monitor import AudioMonitor
+from src.audio_source import AudioSource, SyntheticSource, WavFileSource
+from src.strike_manager import StrikeAction, StrikeManager
+
+
+class BenchConfig:
+    """Só as chaves que o StrikeManager lê."""
+
+    def __init__(self, limite_grito: float, metrica: str):
+        self._valores = {"strikes_enabled": True, "volume_grito_db": limite_grito,
+                         "strike_metrica": metrica}
+
+    def get(self, key, default=None):
+        return self._valores.get(key, default)
+
+
+class BenchLogger:
+    def __init__(self):
+        self.strikes = []
+
+    def strike(self, total: int, nivel_db: float, audio_offset=None):
+        self.strikes.append((total, nivel_db))
+
+
+class RelogioSource(AudioSource):
+    """Repassa a fonte e conta os chunks: relógio simulado da gravação
+    (o callback não vê todos os chunks quando o VAD retém silêncio).
+    """
+
+    INICIO = datetime(2026, 1, 1, 8, 0, 0)
+
+    def __init__(self, source: AudioSource):
+        super().__init__(source.rate, source.chunk)
+        self.source = source
+        self.chunks = 0
+
+    def open(self):
+        self.source.open()
+
+    def read(self) -> bytes:
+        data = self.source.read()
+        if data:
+            self.chunks += 1
+        return data
+
+    def close(self):
+        self.source.close()
+
+    def agora(self) -> datetime:
+        return self.INICIO + timedelta(seconds=self.chunks * self.chunk / self.rate)
+
+
+def rodar(source, limite_grito: float, metrica: str, vad: bool, mostrar: int):
+    logger = BenchLogger()
+    strikes = StrikeManager(BenchConfig(limite_grito, metrica), logger)
+    acoes = Counter()
+    decisoes = []
+    relogio = RelogioSource(source)
+
+    def on_audio(nivel_db, media_db, pico_db, fala):
+        inicio = time.perf_counter()
+        if fala:
+            acao = strikes.processar_barulho(
+                nivel_db, agora=relogio.agora(),
+                nivel_voz_db=monitor.get_nivel_voz(), nivel_a_db=monitor.get_nivel_a(),
+            )
+            if acao != StrikeAction.NONE:
+                acoes[acao.name] += 1
+                decisoes.append((relogio.agora(), acao.name, nivel_db))
+        monitor.registrar_custo_downstream(time.perf_counter() - inicio)
+
+    monitor = AudioMonitor(callback=on_audio, source=relogio, espectral=metrica != "rms", vad=vad,
+                           limite_fala_db=lambda: limite_grito)
+    inicio_cpu, inicio = time.process_time(), time.perf_counter()
+    monitor.run()
+    cpu, parede = time.process_time() - inicio_cpu, time.perf_counter() - inicio
+
+    audio_segundos = (relogio.agora() - RelogioSource.INICIO).total_seconds()
+    print(f"  áudio: {audio_segundos / 3600:.2f} h  CPU: {cpu:.1f} s  parede: {parede:.1f} s")
+    print(f"  vazão: {audio_segundos / max(cpu, 1e-9):,.0f}x tempo real  "
+          f"({cpu / max(audio_segundos / 3600, 1e-9):.2f} s CPU por hora de áudio)")
+    print(f"  strikes: {strikes.get_strikes()}  ações: {dict(acoes) or '-'}")
+    for quando, acao, db in decisoes[:mostrar]:
+        print(f"    {quando:%H:%M:%S}  {acao:<17} {db:5.1f} dB")
+    if len(decisoes) > mostrar:
+        print(f"    ... +{len(decisoes) - mostrar}")
+    if vad:
+        stats = monitor.get_vad_stats()
+        print(f"  VAD: {stats.get('fracao_sem_fala', 0):.1%} sem fala, "
+              f"{stats.get('fracao_retida', 0):.1%} retidos antes do callback, "
+              f"{stats.get('vad_us_por_frame', 0)} us/chunk")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("wavs", nargs="*", help="arquivos WAV PCM 16-bit")
+    parser.add_argument("--sintetico", type=float, metavar="HORAS",
+                        help="usa o gerador sintético em vez de WAV")
+    parser.add_argument("--cenario", default="sala", choices=sorted(SyntheticSource.CENARIOS))
+    parser.add_argument("--limite-grito", type=float, default=85)
+    parser.add_argument("--metrica", default="rms", choices=("rms", "voz", "a"),
+                        help="nível comparado com o limite (strike_metrica)")
+    parser.add_argument("--sem-vad", action="store_true", help="desliga o VAD (todo chunk vai aos strikes)")
+    parser.add_argument("--mostrar", type=int, default=10, help="decisões listadas por fonte")
+    args = parser.parse_args()
+
+    if not args.wavs and args.sintetico is None:
+        parser.error("informe arquivos WAV ou --sintetico HORAS")
+
+    for wav in args.wavs:
+        print(wav)
+        rodar(WavFileSource(wav, speed=0), args.limite_grito, args.metrica, not args.sem_vad, args.mostrar)
+    if args.sintetico is not None:
+        print(f"sintético ({args.cenario}, {args.sintetico} h)")
+        rodar(SyntheticSource(args.cenario, args.sintetico * 3600, speed=0),
+              args.limite_grito, args.metrica, not args.sem_vad, args.mostrar)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Microbenchmark do AudioMonitor._calcular_db
+
+Compara o caminho atual (buffer reaproveitado + dot) com a implementação
+antiga (astype float32 + quadrado + mean) e estima o custo de CPU por hora,
+já que o monitor processa 10 chunks por segundo, o dia inteiro.
+
+Uso: python benchmarks/bench_calcular_db.py [--iteracoes N]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.audio_monitor import AudioMonitor
+
+CHUNKS_POR_HORA = 10 * 3600
+
+
+def calcular_db_referencia(data: bytes) -> float:
+    """Implementação original (aloca 2 arrays float32 por chunk)."""
+    audio_data = np.frombuffer(data, dtype=np.int16).astype(np.float32)
+    if len(audio_data) == 0:
+        return 0.0
+    rms = np.sqrt(np.mean(audio_data ** 2))
+    if rms < 1:
+        return 0.0
+    db = 20 * np.log10(rms / 32768.0) + 96
+    return max(0, min(120, db))
+
+
+def medir(func, chunks, iteracoes: int) -> float:
+    """Tempo médio de CPU (s) por chamada."""
+    inicio = time.process_time()
+    for i in range(iteracoes):
+        func(chunks[i % len(chunks)])
+    return (time.process_time() - inicio) / iteracoes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iteracoes", type=int, default=50000)
+    args = parser.parse_args()
+
+    monitor = AudioMonitor()
+    rng = np.random.default_rng(0)
+    # Silêncio, fala e grito, para exercitar todos os ramos
+    chunks = [
+        (rng.standard_normal(monitor.CHUNK) * amp).clip(-32768, 32767).astype(np.int16).tobytes()
+        for amp in (0.5, 300, 3000, 20000)
+    ]
+
+    for chunk in chunks:
+        novo, antigo = monitor._calcular_db(chunk), calcular_db_referencia(chunk)
+        assert abs(novo - antigo) < 0.01, (novo, antigo)
+
+    resultados = {
+        "referencia": medir(calcular_db_referencia, chunks, args.iteracoes),
+        "atual": medir(monitor._calcular_db, chunks, args.iteracoes),
+    }
+    for nome, por_chamada in resultados.items():
+        print(f"{nome:>10}: {por_chamada * 1e6:7.2f} us/chunk  "
+              f"{por_chamada * CHUNKS_POR_HORA:6.3f} s CPU/hora  "
+              f"({por_chamada * 10 * 100:.4f}% de um núcleo)")
+    print(f"ganho: {resultados['referencia'] / resultados['atual']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
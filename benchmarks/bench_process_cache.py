@@ -0,0 +1,66 @@
+"""
+Benchmark do ProcessCache: varredura de processos do AppBlocker
+
+Compara a varredura antiga (psutil.process_iter(["name", "pid"]) completa a
+cada tick) com ProcessCache.snapshot(), que lê o nome só de PIDs novos ou
+reaproveitados (os conhecidos custam um create_time). Conta as chamadas a
+Process.name()/create_time() (proxy de syscalls) e o tempo por tick.
+
+Uso:
+    python benchmarks/bench_process_cache.py --ticks 100
+"""
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import psutil
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.process_cache import ProcessCache
+
+chamadas = Counter()
+
+
+def _contar(metodo: str):
+    original = getattr(psutil.Process, metodo)
+
+    def contado(self, *args, **kwargs):
+        chamadas[metodo] += 1
+        return original(self, *args, **kwargs)
+
+    setattr(psutil.Process, metodo, contado)
+
+
+def medir(nome: str, tick, ticks: int):
+    chamadas.clear()
+    inicio = time.perf_counter()
+    for _ in range(ticks):
+        tick()
+    ms = (time.perf_counter() - inicio) / ticks * 1e3
+    print(f"{nome:<14} {ms:8.3f} ms/tick  name(): {chamadas['name']:>6}  "
+          f"create_time(): {chamadas['create_time']:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=100)
+    args = parser.parse_args()
+
+    _contar("name")
+    _contar("create_time")
+    print(f"{len(psutil.pids())} processos, {args.ticks} ticks")
+
+    def legado():
+        for proc in psutil.process_iter(["name", "pid"]):
+            (proc.info.get("name") or "").lower()
+
+    cache = ProcessCache()
+    medir("process_iter", legado, args.ticks)
+    medir("ProcessCache", cache.snapshot, args.ticks)
+    print(f"cache: {cache.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Confere e mede o RollingStats (src/audio_stats.py) contra o cálculo ingênuo
+
+Para várias janelas, alimenta a mesma sequência de dB nos dois e verifica a
+cada amostra que média, máximo e p50/p95 batem com sum()/max()/sort() sobre
+um deque. Depois compara o custo por amostra (append + get_media + pico).
+
+Uso: python benchmarks/bench_rolling_stats.py [--amostras N]
+"""
+import argparse
+import math
+import random
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.audio_stats import RollingStats, HIST_BIN_DB
+
+
+def percentil_ingenuo(valores, p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[max(1, math.ceil(p / 100.0 * len(ordenados))) - 1]
+
+
+def sequencia_db(n: int):
+    rng = random.Random(0)
+    db = 40.0
+    for _ in range(n):
+        # Passeio aleatório com picos ocasionais (grito)
+        db = min(120.0, max(0.0, db + rng.gauss(0, 3)))
+        yield min(120.0, db + 40) if rng.random() < 0.02 else db
+
+
+def conferir(tamanho: int, amostras: int):
+    stats = RollingStats(tamanho)
+    janela = deque(maxlen=tamanho)
+    for i, db in enumerate(sequencia_db(amostras)):
+        stats.append(db)
+        janela.append(db)
+        assert abs(stats.media - sum(janela) / len(janela)) < 1e-6, (i, "media")
+        assert stats.maximo == max(janela), (i, "maximo")
+        if i % 37 == 0:
+            for p in (50, 95):
+                # histograma: mesma amostra, resolução de um bin
+                assert abs(stats.percentil(p) - percentil_ingenuo(janela, p)) <= HIST_BIN_DB, (i, p)
+    print(f"janela {tamanho:5d}: ok ({amostras} amostras)")
+
+
+def medir(tamanho: int, amostras: int):
+    valores = list(sequencia_db(amostras))
+
+    janela = deque(maxlen=tamanho)
+    pico = 0.0
+    inicio = time.perf_counter()
+    for db in valores:
+        janela.append(db)
+        if db >= pico:
+            pico = db
+        elif len(janela) == janela.maxlen:
+            pico = max(janela)
+        sum(janela) / len(janela)
+    ingenuo = (time.perf_counter() - inicio) / amostras
+
+    stats = RollingStats(tamanho)
+    inicio = time.perf_counter()
+    for db in valores:
+        stats.append(db)
+        stats.media, stats.maximo
+    rolling = (time.perf_counter() - inicio) / amostras
+
+    print(f"janela {tamanho:5d}: ingênuo {ingenuo * 1e6:7.2f} us/amostra  "
+          f"rolling {rolling * 1e6:5.2f} us/amostra")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--amostras", type=int, default=20000)
+    args = parser.parse_args()
+
+    for tamanho in (1, 10, 100, 600):
+        conferir(tamanho, args.amostras)
+    for tamanho in (100, 600, 3000):
+        medir(tamanho, args.amostras)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark do SiteBlocker: troca da seção KidsPC num hosts grande
+
+Gera um hosts sintético (lista de ad-block com N linhas) num diretório
+temporário e compara a reescrita antiga (lê tudo, split, join, open("w"))
+com o splice em streaming + os.replace do SiteBlocker. Confere que o
+resultado é idêntico e reporta tempo e pico de memória (tracemalloc) para:
+aplicar regras novas, reaplicar as mesmas (no-op, só leitura) e limpar a seção.
+
+Uso:
+    python benchmarks/bench_site_blocker.py --linhas 200000 --dominios 500
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.site_blocker import MARKER_END, MARKER_START, SiteBlocker
+
+
+def legado(path: str, domains):
+    """_apply como era antes: arquivo inteiro em memória, reescrita não atômica."""
+    with open(path, "r", encoding="utf-8") as f:
+        current = f.read()
+    result = []
+    inside = False
+    for line in current.split("\n"):
+        if line.strip() == MARKER_START:
+            inside = True
+            continue
+        if line.strip() == MARKER_END:
+            inside = False
+            continue
+        if not inside:
+            result.append(line)
+    while result and result[-1].strip() == "":
+        result.pop()
+    cleaned = "\n".join(result)
+    lines = [MARKER_START]
+    for domain in domains:
+        lines.append(f"127.0.0.1 {domain}")
+        if not domain.startswith("www."):
+            lines.append(f"127.0.0.1 www.{domain}")
+    lines.append(MARKER_END)
+    if cleaned and not cleaned.endswith("\n"):
+        cleaned += "\n"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(cleaned + "\n" + "\n".join(lines) + "\n")
+
+
+def medir(nome: str, func):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    func()
+    ms = (time.perf_counter() - inicio) * 1e3
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {nome:<28} {ms:8.1f} ms  pico {pico / 1e6:6.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=200000, help="linhas do hosts do usuário")
+    parser.add_argument("--dominios", type=int, default=500)
+    args = parser.parse_args()
+
+    domains = sorted(f"site{i}.com" for i in range(args.dominios))
+    sites = [{"domain": d} for d in domains]
+
+    with tempfile.TemporaryDirectory() as pasta:
+        base = os.path.join(pasta, "hosts.base")
+        with open(base, "w", encoding="utf-8") as f:
+            f.write("# hosts do usuário\n127.0.0.1 localhost\n\n")
+            for i in range(args.linhas):
+                f.write(f"0.0.0.0 ads{i}.tracker-exemplo.net\n")
+        print(f"hosts: {args.linhas} linhas ({os.path.getsize(base) / 1e6:.1f} MB), {args.dominios} domínios")
+
+        antigo = os.path.join(pasta, "hosts.legado")
+        novo = os.path.join(pasta, "hosts")
+        for destino in (antigo, novo):
+            with open(base, "rb") as src, open(destino, "wb") as dst:
+                dst.write(src.read())
+
+        print("legado")
+        medir("aplicar", lambda: legado(antigo, domains))
+        medir("reaplicar (mesmas regras)", lambda: legado(antigo, domains))
+
+        blocker = SiteBlocker(config=None, logger=None, hosts_path=novo)
+        print("streaming + os.replace")
+        medir("aplicar", lambda: blocker.update_rules(sites))
+        mtime = os.stat(novo).st_mtime_ns
+        antes = set(os.listdir(pasta))
+        medir("reaplicar (mesmas regras)", blocker._apply)
+        assert os.stat(novo).st_mtime_ns == mtime, "reaplicar reescreveu o hosts"
+        assert set(os.listdir(pasta)) == antes, "reaplicar criou arquivo temporário"
+        print("  reaplicar: só leitura, nenhum arquivo escrito")
+
+        with open(antigo, "rb") as a, open(novo, "rb") as b:
+            assert a.read() == b.read(), "conteúdo diferente do legado"
+        print("conteúdo idêntico ao legado")
+
+        medir("limpar (cleanup)", blocker.cleanup)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark do WindowTracker: eventos de foreground x polling de 5 s
+
+Gera um dia sintético de trocas de janela (sessões longas e alt-tabs curtos),
+passa pelo WindowTracker com um ScriptedSource e compara o tempo por app com
+o valor exato e com o polling antigo (app na frente a cada N s ganha N s).
+Reporta erro absoluto por app e wakeups de cada abordagem.
+
+Uso:
+    python benchmarks/bench_window_tracker.py --horas 8 --poll 5
+"""
+import argparse
+import random
+import sys
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.window_events import ScriptedSource
+from src.window_tracker import WindowTracker
+
+APPS = [
+    ("chrome.exe", "YouTube - Google Chrome"),
+    ("chrome.exe", "Google Docs - Google Chrome"),
+    ("robloxplayerbeta.exe", "Roblox"),
+    ("discord.exe", "Discord"),
+    ("code.exe", "main.py - Visual Studio Code"),
+    ("winword.exe", "Trabalho.docx - Word"),
+]
+
+
+def gerar_linha_do_tempo(horas: float, seed: int):
+    """Lista de (inicio, processo, título) até `horas`; 40% alt-tabs de 1-8 s."""
+    rng = random.Random(seed)
+    t = datetime(2026, 1, 1, 8, 0, 0).timestamp()
+    fim = t + horas * 3600
+    eventos = []
+    while t < fim:
+        proc, title = rng.choice(APPS)
+        eventos.append((t, proc, title))
+        t += rng.uniform(1, 8) if rng.random() < 0.4 else rng.uniform(30, 900)
+    eventos.append((fim, None, None))  # fecha o último intervalo
+    return eventos
+
+
+def exato(eventos):
+    segundos = defaultdict(float)
+    for (t, proc, _), (t_prox, _, _) in zip(eventos, eventos[1:]):
+        segundos[proc] += t_prox - t
+    return segundos
+
+
+def polling(eventos, intervalo: float):
+    segundos = defaultdict(float)
+    amostras = 0
+    i = 0
+    t = eventos[0][0]
+    while t < eventos[-1][0]:
+        while eventos[i + 1][0] <= t:
+            i += 1
+        segundos[eventos[i][1]] += intervalo
+        amostras += 1
+        t += intervalo
+    return segundos, amostras
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--horas", type=float, default=8)
+    parser.add_argument("--poll", type=float, default=5, help="intervalo do polling antigo (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    eventos = gerar_linha_do_tempo(args.horas, args.seed)
+    real = exato(eventos)
+    por_poll, amostras = polling(eventos, args.poll)
+
+    tracker = WindowTracker(source=ScriptedSource(eventos))
+    tracker.run()
+    por_evento = tracker._app_seconds
+    stats = tracker.get_stats()
+
+    print(f"{args.horas} h, {len(eventos) - 1} trocas de janela")
+    print(f"{'app':<22} {'exato (s)':>10} {'eventos':>10} {'polling':>10}")
+    erro_evento = erro_poll = 0.0
+    for proc in sorted(real, key=real.get, reverse=True):
+        if proc is None:
+            continue
+        erro_evento += abs(por_evento.get(proc, 0) - real[proc])
+        erro_poll += abs(por_poll.get(proc, 0) - real[proc])
+        print(f"{proc:<22} {real[proc]:>10.0f} {por_evento.get(proc, 0):>10.0f} {por_poll.get(proc, 0):>10.0f}")
+    print(f"erro absoluto total: eventos {erro_evento:.0f} s, polling {erro_poll:.0f} s")
+    print(f"wakeups: eventos {stats['wakeups']}, polling {amostras}")
+    visitas = {s["domain"]: s["visit_count"] for s in tracker.get_site_visits()}
+    print(f"visitas: {visitas}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Verificação do CommandListener contra um Realtime de mentira (websocket local)
+
+Sobe um servidor websockets em 127.0.0.1 que fala o mínimo do protocolo
+Phoenix v1 e roda quatro cenários, com HEARTBEAT_SECONDS reduzido:
+- normal: join ok, assinatura confirmada (system ok), heartbeats
+  respondidos, um INSERT chega em on_command
+- meio aberto: o servidor para de responder heartbeats → desconecta
+- system error: assinatura postgres_changes recusada → nunca conta como
+  conectado e reconecta com backoff crescente
+- cai após entrar: o servidor fecha o socket logo depois de confirmar a
+  assinatura → backoff crescente, não uma reconexão por segundo
+
+Uso:
+    python benchmarks/check_command_listener.py
+"""
+import asyncio
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import websockets
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import src.command_listener as command_listener
+from src.command_listener import CommandListener
+
+command_listener.HEARTBEAT_SECONDS = 0.5
+
+
+class RealtimeFalso:
+    """Servidor Phoenix mínimo; `modo` define como ele se comporta."""
+
+    def __init__(self, modo: str):
+        self.modo = modo
+        self.heartbeats = 0
+        self.conexoes = 0
+        self.porta = None
+        self._loop = None
+        self._pronto = threading.Event()
+        self._parar = None
+
+    async def _handler(self, ws):
+        self.conexoes += 1
+        try:
+            await self._atender(ws)
+        except websockets.ConnectionClosed:
+            pass  # o cliente derrubou a conexão: é o que os cenários esperam
+
+    async def _atender(self, ws):
+        async for raw in ws:
+            msg = json.loads(raw)
+            event, topic, ref = msg["event"], msg["topic"], msg["ref"]
+            if event == "phx_join":
+                await ws.send(json.dumps({"topic": topic, "event": "phx_reply", "ref": ref,
+                                          "payload": {"status": "ok", "response": {}}}))
+                if self.modo == "system_error":
+                    await ws.send(json.dumps({"topic": topic, "event": "system", "ref": None, "payload": {
+                        "status": "error", "extension": "postgres_changes", "channel": topic,
+                        "message": "Unable to subscribe to changes with given parameters"}}))
+                    continue
+                await ws.send(json.dumps({"topic": topic, "event": "system", "ref": None, "payload": {
+                    "status": "ok", "extension": "postgres_changes", "channel": topic,
+                    "message": "Subscribed to PostgreSQL"}}))
+                if self.modo == "cai_apos_entrar":
+                    await ws.close()
+                elif self.modo == "normal":
+                    await ws.send(json.dumps({"topic": topic, "event": "postgres_changes", "ref": None,
+                                              "payload": {"data": {"record": {"id": "cmd-1"}}}}))
+            elif event == "heartbeat":
+                self.heartbeats += 1
+                if self.modo != "meio_aberto":
+                    await ws.send(json.dumps({"topic": "phoenix", "event": "phx_reply", "ref": ref,
+                                              "payload": {"status": "ok", "response": {}}}))
+
+    async def _main(self):
+        self._parar = asyncio.Event()
+        async with websockets.serve(self._handler, "127.0.0.1", 0) as server:
+            self.porta = server.sockets[0].getsockname()[1]
+            self._pronto.set()
+            await self._parar.wait()
+
+    def start(self):
+        def rodar():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self._main())
+        threading.Thread(target=rodar, daemon=True).start()
+        self._pronto.wait(5)
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._parar.set)
+
+
+def esperar(cond, timeout: float) -> bool:
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if cond():
+            return True
+        time.sleep(0.05)
+    return cond()
+
+
+def cenario(modo: str):
+    servidor = RealtimeFalso(modo)
+    servidor.start()
+    comandos, estados = [], []
+    listener = CommandListener(f"ws://127.0.0.1:{servidor.porta}/realtime/v1/websocket", "anon",
+                               "token", "pc-1", on_command=comandos.append, on_state=estados.append)
+    listener.start()
+    try:
+        hb = command_listener.HEARTBEAT_SECONDS
+        if modo in ("system_error", "cai_apos_entrar"):
+            # Reconexões em 0, ~1s, ~3s, ~7s...; com backoff preso em 1s seriam 5+
+            time.sleep(5)
+            assert servidor.conexoes <= 3, f"{modo}: {servidor.conexoes} conexões em 5s"
+            if modo == "system_error":
+                assert estados == [], f"system error: contou como conectado ({estados})"
+                assert comandos == [], f"system error: comandos {comandos}"
+            print(f"  {modo:<15} ok  conexões em 5s={servidor.conexoes} estados={estados[:4]}")
+            return
+        assert esperar(lambda: estados[:1] == [True], 3), f"{modo}: assinatura não conectou ({estados})"
+        if modo == "normal":
+            time.sleep(hb * 4)
+            assert listener.is_connected(), "normal: caiu com heartbeats respondidos"
+            assert servidor.heartbeats >= 2, f"normal: {servidor.heartbeats} heartbeats"
+            assert comandos == [{"id": "cmd-1"}], f"normal: comandos {comandos}"
+        elif modo == "meio_aberto":
+            assert esperar(lambda: False in estados, hb * 4), "meio aberto: não desconectou"
+        print(f"  {modo:<15} ok  estados={estados[:4]} heartbeats={servidor.heartbeats}")
+    finally:
+        listener.stop()
+        servidor.stop()
+
+
+def main():
+    print(f"HEARTBEAT_SECONDS={command_listener.HEARTBEAT_SECONDS}")
+    for modo in ("normal", "meio_aberto", "system_error", "cai_apos_entrar"):
+        cenario(modo)
+    print("todos os cenários ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Verificação do envio de sessões (outbox → upsert em lote) contra um PostgREST de mentira
+
+Sobe um servidor HTTP local que responde como o PostgREST a
+POST /rest/v1/<tabela>?on_conflict=... (índice único sobre as colunas de
+on_conflict, Prefer: resolution=ignore-duplicates|merge-duplicates) e roda o
+caminho real do RemoteSync (_queue_sessions + _drain_table) em três cenários:
+- lote: N sessões pendentes saem em ceil(N/UPSERT_CHUNK_SIZE) requests
+- retry idempotente: o servidor grava mas a resposta se perde; o reenvio
+  não duplica nada no banco
+- só limpa após o ack: com o servidor recusando (503), as linhas continuam no
+  outbox e saem no ciclo seguinte
+
+Usa o cliente postgrest se estiver instalado; senão um cliente urllib que
+manda o mesmo request HTTP.
+
+Uso:
+    python benchmarks/check_outbox_sync.py --sessoes 1200
+"""
+import argparse
+import json
+import math
+import sys
+import tempfile
+import threading
+import urllib.request
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.activity_tracker import ActivityTracker
+from src.outbox import Outbox
+from src.remote_sync import UPSERT_CHUNK_SIZE, RemoteSync
+
+PC_ID = "pc-teste"
+USER_ID = "user-teste"
+
+
+class PostgrestFalso(ThreadingHTTPServer):
+    """Tabelas em memória; `modo` = "ok" | "perde_resposta" | "recusa"."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.tabelas = {}  # tabela → {chave on_conflict: linha}
+        self.requests = 0
+        self.modo = "ok"
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/rest/v1"
+
+    def upsert(self, tabela: str, on_conflict: str, prefer: str, linhas: list) -> list:
+        colunas = on_conflict.split(",")
+        ignorar = "resolution=ignore-duplicates" in prefer
+        gravadas = []
+        with self._lock:
+            tabela_ = self.tabelas.setdefault(tabela, {})
+            for linha in linhas:
+                chave = tuple(linha[c] for c in colunas)
+                if chave in tabela_ and ignorar:
+                    continue
+                tabela_[chave] = linha
+                gravadas.append(linha)
+        return gravadas
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        servidor: PostgrestFalso = self.server
+        servidor.requests += 1
+        corpo = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if servidor.modo == "recusa":
+            self._responder(503, {"message": "service unavailable"})
+            return
+        url = urlparse(self.path)
+        tabela = url.path.rsplit("/", 1)[-1]
+        on_conflict = parse_qs(url.query).get("on_conflict", [""])[0]
+        linhas = corpo if isinstance(corpo, list) else [corpo]
+        gravadas = servidor.upsert(tabela, on_conflict, self.headers.get("Prefer", ""), linhas)
+        if servidor.modo == "perde_resposta":
+            # Commit feito, conexão cai antes da resposta (timeout/Wi-Fi)
+            self.close_connection = True
+            self.connection.close()
+            return
+        self._responder(201, gravadas)
+
+    def _responder(self, status: int, corpo):
+        dados = json.dumps(corpo).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Upsert:
+    def __init__(self, url: str, linhas: list, on_conflict: str, ignore_duplicates: bool):
+        self.url = f"{url}?on_conflict={on_conflict}"
+        self.linhas = linhas
+        resolucao = "ignore-duplicates" if ignore_duplicates else "merge-duplicates"
+        self.prefer = f"resolution={resolucao},return=representation"
+
+    def execute(self):
+        req = urllib.request.Request(self.url, data=json.dumps(self.linhas).encode(), method="POST",
+                                     headers={"Content-Type": "application/json", "Prefer": self.prefer})
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return json.loads(resp.read())
+
+
+class _Tabela:
+    def __init__(self, url: str):
+        self.url = url
+
+    def upsert(self, linhas, on_conflict: str = "", ignore_duplicates: bool = False):
+        return _Upsert(self.url, linhas, on_conflict, ignore_duplicates)
+
+
+class ClienteUrllib:
+    """Só o pedaço da API do supabase-py que o _drain_table usa."""
+
+    def __init__(self, url: str):
+        self.url = url
+
+    def table(self, nome: str) -> _Tabela:
+        return _Tabela(f"{self.url}/{nome}")
+
+
+def criar_cliente(url: str):
+    try:
+        from postgrest import SyncPostgrestClient
+    except ImportError:
+        return ClienteUrllib(url), "urllib"
+    return SyncPostgrestClient(url, headers={"apikey": "anon"}), "postgrest"
+
+
+def criar_sync(pasta: str, tracker: ActivityTracker) -> RemoteSync:
+    config = {"pc_id": PC_ID, "user_id": USER_ID}
+    return RemoteSync(config, None, tracker, None, None, None, None,
+                      outbox=Outbox(Path(pasta) / "outbox.db"))
+
+
+def sessoes_sinteticas(tracker: ActivityTracker, n: int, inicio: datetime):
+    for i in range(n):
+        comeco = inicio + timedelta(minutes=10 * i)
+        tracker._pending_sessions.append({
+            "started_at": comeco.isoformat(),
+            "ended_at": (comeco + timedelta(minutes=7)).isoformat(),
+            "duration_minutes": 7,
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessoes", type=int, default=1200)
+    args = parser.parse_args()
+    n = args.sessoes
+
+    servidor = PostgrestFalso()
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    cliente, tipo = criar_cliente(servidor.url)
+    print(f"PostgREST falso em {servidor.url} (cliente {tipo}), {n} sessões, chunk {UPSERT_CHUNK_SIZE}")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        tracker = ActivityTracker()
+        sync = criar_sync(pasta, tracker)
+        banco = lambda: len(servidor.tabelas.get("usage_sessions", {}))
+
+        # 1. lote: poucos requests, tudo confirmado
+        sessoes_sinteticas(tracker, n, datetime(2026, 1, 5, 8))
+        sync._queue_sessions(PC_ID, USER_ID)
+        assert tracker.get_pending_sessions() == [], "sessões não foram para o outbox"
+        sync._drain_table(cliente, "usage_sessions")
+        esperados = math.ceil(n / UPSERT_CHUNK_SIZE)
+        assert servidor.requests == esperados, f"lote: {servidor.requests} requests, esperado {esperados}"
+        assert banco() == n, f"lote: {banco()} linhas no banco"
+        assert sync.outbox.depth("usage_sessions") == 0, "lote: outbox não esvaziou"
+        print(f"  lote               ok  {servidor.requests} requests para {n} sessões")
+
+        # 2. resposta perdida: fica no outbox, reenvio não duplica
+        servidor.requests = 0
+        sessoes_sinteticas(tracker, 10, datetime(2026, 1, 20, 8))
+        sync._queue_sessions(PC_ID, USER_ID)
+        servidor.modo = "perde_resposta"
+        sync._drain_table(cliente, "usage_sessions")
+        assert banco() == n + 10, "retry: servidor deveria ter gravado o lote"
+        assert sync.outbox.depth("usage_sessions") == 10, "retry: lote sem ack saiu do outbox"
+        servidor.modo = "ok"
+        sync._drain_table(cliente, "usage_sessions")
+        assert banco() == n + 10, f"retry: {banco() - n - 10} sessões duplicadas"
+        assert sync.outbox.depth("usage_sessions") == 0, "retry: outbox não esvaziou após o ack"
+        print(f"  retry idempotente  ok  {servidor.requests} requests, nenhuma duplicata")
+
+        # 3. servidor recusando: nada sai do outbox até o ack
+        servidor.requests = 0
+        sessoes_sinteticas(tracker, 5, datetime(2026, 2, 1, 8))
+        sync._queue_sessions(PC_ID, USER_ID)
+        servidor.modo = "recusa"
+        sync._drain_table(cliente, "usage_sessions")
+        sync._drain_table(cliente, "usage_sessions")
+        assert sync.outbox.depth("usage_sessions") == 5, "recusa: linhas saíram sem ack"
+        assert banco() == n + 10, "recusa: servidor gravou com 503"
+        servidor.modo = "ok"
+        sync._drain_table(cliente, "usage_sessions")
+        assert sync.outbox.depth("usage_sessions") == 0 and banco() == n + 15, "recusa: não drenou depois"
+        print(f"  só limpa após ack  ok  {servidor.requests} requests (2 recusados)")
+
+        sync.outbox.close()
+    servidor.shutdown()
+    print("todos os cenários ok")
+
+
+if __name__ == "__main__":
+    main()
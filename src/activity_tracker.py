@@ -1,7 +1,7 @@
 import ctypes
 import time
 from datetime import datetime, date
-from threading import Thread, Event
+from threading import Thread, Event, Lock
 from typing import Optional, Callable, List, Dict
 
 
@@ -32,6 +32,7 @@ class ActivityTracker:
         
         self._sessions_today: List[Dict] = []
         self._pending_sessions: List[Dict] = []
+        self._pending_lock = Lock()
         
         self._time_penalty_seconds: float = 0.0
     
@@ -77,7 +78,8 @@ class ActivityTracker:
             "duration_minutes": int(duration_seconds / 60),
         }
         self._sessions_today.append(session)
-        self._pending_sessions.append(session)
+        with self._pending_lock:
+            self._pending_sessions.append(session)
         
         self._today_accumulated_seconds += duration_seconds
         self._is_active = False
@@ -159,10 +161,21 @@ class ActivityTracker:
         return self.get_usage_today_minutes() + self.get_time_penalty_minutes()
     
     def get_pending_sessions(self) -> List[Dict]:
-        """Retorna sessões ainda não sincronizadas e limpa a lista."""
-        sessions = self._pending_sessions.copy()
-        self._pending_sessions.clear()
-        return sessions
+        """Retorna sessões ainda não sincronizadas (sem limpar a lista).
+        
+        A lista só é limpa via mark_sessions_synced(), depois que as sessões
+        foram gravadas no outbox do RemoteSync — nada se perde no caminho.
+        """
+        with self._pending_lock:
+            return self._pending_sessions.copy()
+    
+    def mark_sessions_synced(self, started_at: List[str]):
+        """Remove da fila as sessões confirmadas pelo servidor."""
+        acked = set(started_at)
+        with self._pending_lock:
+            self._pending_sessions = [
+                s for s in self._pending_sessions if s["started_at"] not in acked
+            ]
     
     def get_sessions_today(self) -> List[Dict]:
         """Retorna todas as sessões de hoje."""
@@ -2,10 +2,22 @@
 
 Monitora processos ativos e encerra os que estão na lista de bloqueio (blacklist)
 ou fora da lista de permissão (whitelist).
+
+Roda numa thread própria: a cada WATCH_INTERVAL_SECONDS compara os
+processos (pid, create_time) com os da varredura anterior e só avalia os
+novos — inclusive um PID reaproveitado — ou todos, uma vez, quando as
+regras mudam. Sem regras a thread fica parada até chegar a primeira.
 """
 
+import threading
+import time
+from collections import Counter, deque
+
 import psutil
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+from src.app_rules import CompiledRules
+from src.process_cache import ProcessCache
 
 
 # Processos do sistema que NUNCA devem ser encerrados
@@ -30,37 +42,102 @@ SYSTEM_PROCESSES = {
     "networkservice.exe", "localservice.exe",
 }
 
+# psutil.pids() + diff custa ~0.1 ms; 0.5s limita o tempo até o kill
+WATCH_INTERVAL_SECONDS = 0.5
+
 
 class AppBlocker:
     """Monitora e bloqueia aplicativos baseado em regras do painel web."""
     
-    def __init__(self, config, logger):
+    def __init__(self, config, logger, process_cache: Optional[ProcessCache] = None):
         self.config = config
         self.logger = logger
-        self._rules: List[str] = []  # lista de nomes de processo (lowercase)
+        # Nomes de processo resolvidos uma vez por processo (compartilhado com WindowTracker)
+        self.process_cache = process_cache or ProcessCache()
+        self._rules = CompiledRules([])  # nomes, globs, pastas e editores (src/app_rules.py)
         self._mode: str = "blacklist"  # 'blacklist' ou 'whitelist'
         self._enabled: bool = False
+        
+        # PID → create_time dos processos já avaliados com as regras atuais
+        self._avaliados: Dict[int, float] = {}
+        self._regras_mudaram = False
+        self._regras_em = time.time()
+        self._running = threading.Event()
+        self._tem_regras = threading.Event()  # acorda o watcher parado sem regras
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"ticks": 0, "avaliados": 0, "encerrados": 0}
+        self._kill_latency: deque = deque(maxlen=100)  # início do processo → kill (s)
+        self._kills_por_regra: Counter = Counter()
     
     def update_rules(self, apps: List[Dict[str, Any]], mode: str):
         """Atualiza regras de bloqueio. Chamado pelo RemoteSync."""
-        self._rules = [a.get("name", "").lower().strip() for a in apps if a.get("name")]
-        self._mode = mode if mode in ("blacklist", "whitelist") else "blacklist"
+        rules = CompiledRules(a.get("name", "") for a in apps if a.get("name"))
+        mode = mode if mode in ("blacklist", "whitelist") else "blacklist"
+        if rules.regras == self._rules.regras and mode == self._mode:
+            return
+        
+        self._rules = rules
+        self._mode = mode
         self._enabled = len(self._rules) > 0
+        self._regras_mudaram = True  # reavalia todos os processos uma vez
+        self._regras_em = time.time()
+        if self._enabled:
+            self._tem_regras.set()
+        else:
+            self._tem_regras.clear()
         
         if self._enabled:
             print(f"AppBlocker: {len(self._rules)} regras ({self._mode})")
     
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._running.set()
+        if self._enabled:
+            self._tem_regras.set()
+        else:
+            self._tem_regras.clear()
+        self._thread = threading.Thread(target=self._watch_loop, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._running.clear()
+        self._tem_regras.set()  # acorda o watcher parado
+        if self._thread:
+            self._thread.join(timeout=2)
+    
+    def _watch_loop(self):
+        while self._running.is_set():
+            if not self._enabled:
+                self._tem_regras.wait()
+                continue
+            try:
+                self.check()
+            except Exception as e:
+                print(f"AppBlocker: erro na verificação: {e}")
+            time.sleep(WATCH_INTERVAL_SECONDS)
+    
     def check(self):
-        """Verifica processos e encerra os bloqueados.
-        
-        Deve ser chamado periodicamente (a cada 3-5 segundos).
-        """
+        """Avalia processos novos desde a última chamada e encerra os bloqueados."""
         if not self._enabled:
             return
         
-        for proc in psutil.process_iter(["name", "pid"]):
+        self._stats["ticks"] += 1
+        snapshot = self.process_cache.snapshot()
+        if self._regras_mudaram:
+            self._regras_mudaram = False
+            self._avaliados.clear()
+        anteriores = self._avaliados
+        self._avaliados = {pid: info.create_time for pid, info in snapshot.items()}
+        
+        # snapshot() relê o create_time de cada PID: um processo novo que
+        # pegou um PID recém-liberado não casa com o valor anterior
+        for pid, info in snapshot.items():
+            if anteriores.get(pid) == info.create_time:
+                continue
+            self._stats["avaliados"] += 1
             try:
-                pname = (proc.info.get("name") or "").lower()
+                pname = info.name
                 if not pname:
                     continue
                 
@@ -69,24 +146,54 @@ class AppBlocker:
                     continue
                 
                 should_kill = False
+                # Caminho/editor só são lidos se houver regras desse tipo
+                regra = self._rules.match(
+                    pname,
+                    caminho=lambda: self.process_cache.exe(info),
+                    publisher=lambda: self.process_cache.publisher(info),
+                )
                 
                 if self._mode == "blacklist":
-                    # Blacklist: matar se está na lista
-                    should_kill = pname in self._rules
+                    # Blacklist: matar se alguma regra casou
+                    should_kill = regra is not None
                 elif self._mode == "whitelist":
-                    # Whitelist: matar se NÃO está na lista e NÃO é sistema
-                    should_kill = pname not in self._rules
+                    # Whitelist: matar se nenhuma regra casou e NÃO é sistema
+                    should_kill = regra is None
+                    regra = "fora da lista de permissão"
                 
                 if should_kill:
+                    proc = psutil.Process(pid)
+                    if not ProcessCache.matches(info, proc):
+                        continue  # PID reaproveitado desde a varredura
                     proc.terminate()
-                    display = proc.info.get("name", pname)
-                    print(f"AppBlocker: encerrado '{display}' (pid={proc.info['pid']})")
+                    self._stats["encerrados"] += 1
+                    self._kills_por_regra[regra] += 1
+                    if info.create_time >= self._regras_em:
+                        self._kill_latency.append(time.time() - info.create_time)
+                    print(f"AppBlocker: encerrado '{pname}' (pid={pid}, regra: {regra})")
                     try:
-                        self.logger.registrar("app_killed", f"Aplicativo bloqueado: {display}")
+                        self.logger.registrar("app_killed", f"Aplicativo bloqueado: {pname} (regra: {regra})")
                     except Exception:
                         pass
                     
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            except psutil.AccessDenied:
+                self._avaliados.pop(pid, None)  # tenta de novo no próximo tick
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
                 pass
             except Exception as e:
                 print(f"AppBlocker: erro ao verificar processo: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Ticks, processos avaliados/encerrados e tempo do início do processo
+        até o kill (média, p95, máx em segundos; só processos iniciados
+        depois da última mudança de regras).
+        """
+        stats: Dict[str, Any] = dict(self._stats)
+        samples = sorted(self._kill_latency)
+        if samples:
+            stats["kill_latency_avg"] = round(sum(samples) / len(samples), 2)
+            stats["kill_latency_p95"] = round(samples[int(0.95 * (len(samples) - 1))], 2)
+            stats["kill_latency_max"] = round(samples[-1], 2)
+        stats["kills_por_regra"] = dict(self._kills_por_regra)
+        stats["process_cache"] = self.process_cache.get_stats()
+        return stats
@@ -0,0 +1,111 @@
+"""Índice compilado das regras de bloqueio de aplicativos.
+
+Cada regra vem do painel como texto (coluna `name` de blocked_apps) e o
+formato define o tipo:
+- "roblox.exe"                  nome exato do executável
+- "roblox*.exe", "*launcher?"   glob sobre o nome (* e ? e [...])
+- "C:\\Games\\Roblox"           pasta de instalação: qualquer exe dentro dela,
+                                mesmo renomeado
+- "publisher:Roblox Corporation" editor do executável (CompanyName do
+                                recurso de versão, sem checar assinatura)
+
+O índice é montado uma vez por update_rules: frozenset para nomes exatos,
+uma única regex para todos os globs e uma trie de componentes de caminho
+para as pastas. Caminho e editor só são consultados se houver regras
+desses tipos.
+"""
+
+import fnmatch
+import re
+from typing import Callable, Dict, Iterable, List, Optional
+
+PREFIXO_PUBLISHER = "publisher:"
+_CURINGAS = set("*?[")
+_SEPARADORES_RE = re.compile(r"[\\/]+")
+_FIM = ""  # chave de nó terminal na trie (nenhum componente de caminho é vazio)
+
+
+def _componentes(caminho: str) -> List[str]:
+    return [c for c in _SEPARADORES_RE.split(caminho.lower()) if c]
+
+
+class CompiledRules:
+    """Regras compiladas; match() devolve a regra que casou (texto original) ou None."""
+
+    def __init__(self, regras: Iterable[str]):
+        self.regras = sorted({r.strip().lower() for r in regras if r and r.strip()})
+        exatos = set()
+        globs: List[str] = []
+        self._publishers: Dict[str, str] = {}
+        self._trie: Dict = {}
+        self.total_pastas = 0
+
+        for regra in self.regras:
+            if regra.startswith(PREFIXO_PUBLISHER):
+                nome = regra[len(PREFIXO_PUBLISHER):].strip()
+                if nome:
+                    self._publishers[nome] = regra
+            elif "\\" in regra or "/" in regra:
+                self._adicionar_pasta(regra)
+            elif _CURINGAS & set(regra):
+                globs.append(regra)
+            else:
+                exatos.add(regra)
+
+        self._exatos = frozenset(exatos)
+        self._globs = [(g, re.compile(fnmatch.translate(g))) for g in globs]
+        # Uma regex só: o laço sobre as alternativas roda em C. Qual glob
+        # casou só é procurado depois de um acerto (raro)
+        self._globs_re = (
+            re.compile("|".join(f"(?:{fnmatch.translate(g)})" for g in globs)) if globs else None
+        )
+
+    def _adicionar_pasta(self, regra: str):
+        no = self._trie
+        for componente in _componentes(regra):
+            no = no.setdefault(componente, {})
+        if no is not self._trie:
+            no[_FIM] = regra
+            self.total_pastas += 1
+
+    def __len__(self) -> int:
+        return len(self.regras)
+
+    @property
+    def usa_caminho(self) -> bool:
+        return bool(self._trie)
+
+    @property
+    def usa_publisher(self) -> bool:
+        return bool(self._publishers)
+
+    def _match_pasta(self, caminho: str) -> Optional[str]:
+        no = self._trie
+        for componente in _componentes(caminho):
+            no = no.get(componente)
+            if no is None:
+                return None
+            if _FIM in no:
+                return no[_FIM]
+        return None
+
+    def match(self, nome: str, caminho: Callable[[], Optional[str]] = lambda: None,
+              publisher: Callable[[], Optional[str]] = lambda: None) -> Optional[str]:
+        """`nome` em lowercase; `caminho` e `publisher` são chamados sob demanda."""
+        if nome in self._exatos:
+            return nome
+        if self._globs_re is not None and self._globs_re.match(nome):
+            for texto, padrao in self._globs:
+                if padrao.match(nome):
+                    return texto
+        if self._trie:
+            exe = caminho()
+            if exe:
+                regra = self._match_pasta(exe)
+                if regra:
+                    return regra
+        if self._publishers:
+            editor = publisher()
+            if editor:
+                return self._publishers.get(editor.strip().lower())
+        return None
@@ -0,0 +1,158 @@
+"""Log circular em disco das features de áudio (um registro por chunk).
+
+Responde "por que teve strike às 17:03?": guarda dB, dB na banda de voz,
+pico do chunk e a flag de fala de cada chunk (~100ms) dos últimos dias em
+%APPDATA%/KidsPC/audio_features.bin.
+
+Formato: cabeçalho de 64 bytes + `capacidade` registros de 12 bytes,
+acessados via numpy.memmap (o arquivo nunca é lido inteiro). O cabeçalho
+guarda o total de registros já escritos (`seq`); o registro n fica no
+slot n % capacidade. Registros estão em ordem de tempo, então a leitura
+por intervalo é uma busca binária sobre o ring.
+"""
+
+import os
+import struct
+import time
+from bisect import bisect_left
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional
+
+import numpy as np
+
+MAGIC = b"KPCAUD1\0"
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<8sIIQ")  # magic, tamanho do registro, capacidade, seq
+
+RECORD_DTYPE = np.dtype([
+    ("seg", "<u4"),     # unix time (s)
+    ("decis", "u1"),    # décimos de segundo
+    ("flags", "u1"),    # bit 0: fala
+    ("db", "<u2"),      # dB × 100
+    ("voz", "<u2"),     # dB na banda de voz × 100 (0 sem estágio espectral)
+    ("pico", "<u2"),    # dB de pico (maior amostra do chunk) × 100
+])
+assert RECORD_DTYPE.itemsize == 12
+
+DIAS_PADRAO = 7
+REGISTROS_POR_DIA = 10 * 86400
+FLUSH_SECONDS = 60
+FLAG_FALA = 1
+
+
+class _Tempos:
+    """Sequência (ordem lógica, do mais antigo ao mais novo) de timestamps em
+    décimos de segundo, para bisect sem copiar o ring.
+    """
+
+    def __init__(self, log: "AudioFeatureLog", inicio: int, fim: int):
+        self._log = log
+        self._inicio = inicio
+        self._fim = fim
+
+    def __len__(self) -> int:
+        return self._fim - self._inicio
+
+    def __getitem__(self, i: int) -> int:
+        rec = self._log._mm[(self._inicio + i) % self._log.capacidade]
+        return int(rec["seg"]) * 10 + int(rec["decis"])
+
+
+class AudioFeatureLog:
+    """Ring file de features por chunk com escrita O(1) e leitura por intervalo."""
+
+    def __init__(self, path: Optional[Path] = None, dias: int = DIAS_PADRAO):
+        if path is None:
+            app_data_dir = Path(os.environ.get("APPDATA", ".")) / "KidsPC"
+            app_data_dir.mkdir(parents=True, exist_ok=True)
+            path = app_data_dir / "audio_features.bin"
+        self.path = Path(path)
+        self.capacidade = dias * REGISTROS_POR_DIA
+        self._lock = Lock()
+        self._ultimo_flush = time.monotonic()
+        self._abrir()
+
+    def _abrir(self):
+        tamanho = HEADER_SIZE + self.capacidade * RECORD_DTYPE.itemsize
+        seq = 0
+        if self.path.exists() and self.path.stat().st_size == tamanho:
+            with open(self.path, "rb") as f:
+                magic, rec_size, capacidade, seq_lido = _HEADER.unpack(f.read(_HEADER.size))
+            if magic == MAGIC and rec_size == RECORD_DTYPE.itemsize and capacidade == self.capacidade:
+                seq = seq_lido
+        if seq == 0:
+            # Novo (ou formato/tamanho diferente): recria do zero
+            with open(self.path, "wb") as f:
+                f.truncate(tamanho)
+        self._header = np.memmap(self.path, dtype=np.uint8, mode="r+", shape=(HEADER_SIZE,))
+        self._mm = np.memmap(self.path, dtype=RECORD_DTYPE, mode="r+",
+                             offset=HEADER_SIZE, shape=(self.capacidade,))
+        self.seq = seq
+        self._gravar_header()
+
+    def _gravar_header(self):
+        self._header[:_HEADER.size] = np.frombuffer(
+            _HEADER.pack(MAGIC, RECORD_DTYPE.itemsize, self.capacidade, self.seq), dtype=np.uint8
+        )
+
+    def append(self, db: float, voz: float, pico: float, fala: bool, agora: Optional[float] = None) -> int:
+        """Grava um registro e retorna seu offset lógico (seq)."""
+        agora = time.time() if agora is None else agora
+        seg, decis = divmod(int(round(agora * 10)), 10)
+        with self._lock:
+            seq = self.seq
+            self._mm[seq % self.capacidade] = (
+                seg, decis, FLAG_FALA if fala else 0,
+                int(db * 100), int(voz * 100), int(pico * 100),
+            )
+            self.seq = seq + 1
+            self._gravar_header()
+            if time.monotonic() - self._ultimo_flush >= FLUSH_SECONDS:
+                self._mm.flush()
+                self._header.flush()
+                self._ultimo_flush = time.monotonic()
+        return seq
+
+    def offset_arquivo(self, seq: int) -> int:
+        """Posição em bytes do registro `seq` no arquivo."""
+        return HEADER_SIZE + (seq % self.capacidade) * RECORD_DTYPE.itemsize
+
+    def _intervalo_valido(self):
+        return max(0, self.seq - self.capacidade), self.seq
+
+    def _ler(self, inicio: int, fim: int) -> List[Dict]:
+        registros = []
+        for seq in range(inicio, fim):
+            rec = self._mm[seq % self.capacidade]
+            registros.append({
+                "seq": seq,
+                "timestamp": int(rec["seg"]) + int(rec["decis"]) / 10,
+                "db": int(rec["db"]) / 100,
+                "voz": int(rec["voz"]) / 100,
+                "pico": int(rec["pico"]) / 100,
+                "fala": bool(rec["flags"] & FLAG_FALA),
+            })
+        return registros
+
+    def ler_intervalo(self, inicio: float, fim: float, limite: int = 36000) -> List[Dict]:
+        """Registros com timestamp em [inicio, fim) (unix time), no máximo `limite`."""
+        with self._lock:
+            primeiro, ultimo = self._intervalo_valido()
+            tempos = _Tempos(self, primeiro, ultimo)
+            a = bisect_left(tempos, int(inicio * 10))
+            b = bisect_left(tempos, int(fim * 10))
+            return self._ler(primeiro + a, primeiro + min(b, a + limite))
+
+    def ler_ao_redor(self, seq: int, antes: int = 100, depois: int = 20) -> List[Dict]:
+        """Registros em volta de um offset (ex: o `audio_offset` de um strike)."""
+        with self._lock:
+            primeiro, ultimo = self._intervalo_valido()
+            return self._ler(max(primeiro, seq - antes), min(ultimo, seq + depois + 1))
+
+    def close(self):
+        with self._lock:
+            self._mm.flush()
+            self._header.flush()
+            del self._mm
+            del self._header
@@ -1,111 +1,430 @@
 import numpy as np
-import pyaudio
-from collections import deque
-from threading import Thread, Event
-from typing import Callable, Optional
+import queue
+from threading import Thread, Event, Lock
+from typing import Callable, List, Optional, Tuple
+import math
 import time
 
+from src.audio_log import AudioFeatureLog
+from src.audio_source import AudioSource, PyAudioSource
+from src.audio_spectral import SpectralAnalyzer
+from src.audio_vad import VoiceActivityDetector
+from src.audio_stats import RollingStats
+
+# 20*log10(32768): converte RMS de int16 para dBFS antes do offset de +96
+_DBFS_OFFSET = 20 * math.log10(32768.0)
+
+# Modo economia (PC ocioso ou bloqueado): 16 kHz basta para volume, chunks
+# de 250ms e captura em janelas de 1s a cada 3s
+ECONOMIA_RATE = 16000
+ECONOMIA_CHUNK = 4000
+ECONOMIA_ATIVO_SEGUNDOS = 1.0
+ECONOMIA_PAUSA_SEGUNDOS = 2.0
+
+# Com VAD, chunks sem fala só chegam ao callback se o nível mudar isso
+# (o medidor acompanha) ou a cada VAD_REFRESH_SECONDS
+VAD_UI_DELTA_DB = 1.5
+VAD_REFRESH_SECONDS = 1.0
+
+
+def _energia_para_db(energia: float) -> float:
+    """Energia média por amostra (rms²) → dB na escala do monitor (0-120)."""
+    if energia < 1:  # rms < 1
+        return 0.0
+    db = 10 * math.log10(energia) - _DBFS_OFFSET + 96
+    return max(0, min(120, db))
+
+
+class AudioSubscription:
+    """Fila limitada de um consumidor do barramento de captura do AudioMonitor.
+    
+    Cada item é (timestamp, db), ou (timestamp, db, frames) se assinado com
+    frames=True (bytes int16 do chunk, compartilhados — não modificar).
+    Consumidor atrasado perde as amostras mais antigas, nunca trava a captura.
+    """
+    
+    def __init__(self, monitor: "AudioMonitor", maxsize: int, frames: bool):
+        self._monitor = monitor
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self.frames = frames
+        self.descartadas = 0
+    
+    def _publish(self, item: tuple):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            try:
+                self._queue.get_nowait()
+                self.descartadas += 1
+                self._queue.put_nowait(item)
+            except (queue.Empty, queue.Full):
+                pass
+    
+    def get(self, timeout: Optional[float] = None) -> Optional[Tuple]:
+        """Próxima amostra, ou None se nada chegar dentro do timeout."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+    
+    def drain(self) -> List[Tuple]:
+        """Todas as amostras pendentes (não bloqueia)."""
+        itens = []
+        while True:
+            try:
+                itens.append(self._queue.get_nowait())
+            except queue.Empty:
+                return itens
+    
+    def close(self):
+        self._monitor.unsubscribe(self)
+
+
 class AudioMonitor:
-    def __init__(self, janela_segundos: int = 10, callback: Optional[Callable] = None):
+    """Dono único do microfone. Além do callback principal, publica cada chunk
+    para assinantes (calibração, widgets ao vivo) via subscribe().
+    
+    A entrada vem de um AudioSource (src/audio_source.py): microfone por
+    padrão, ou WAV/sintética para replay e benchmarks.
+    
+    callback(db, media, pico, fala). Com vad=True, `fala` vem do
+    VoiceActivityDetector e chunks sem fala e sem mudança de nível nem
+    chegam ao callback; chunks em limite_fala_db() ou acima contam sempre
+    como fala.
+    
+    Com audio_log (src/audio_log.py), cada chunk vira um registro no ring
+    file de features; get_audio_log_offset() aponta o último.
+    
+    set_economia(True) troca para captura de baixo consumo (ECONOMIA_*);
+    set_economia(False) volta na hora, interrompendo a pausa em curso.
+    """
+    
+    def __init__(self, janela_segundos: int = 10, callback: Optional[Callable] = None,
+                 source: Optional[AudioSource] = None, espectral: bool = False,
+                 vad: bool = False, audio_log: Optional[AudioFeatureLog] = None,
+                 limite_fala_db: Optional[Callable[[], float]] = None):
         self.janela_segundos = janela_segundos
         self.callback = callback
+        self.source = source
+        # Estágio espectral (src/audio_spectral.py): dB ponderado A e banda de voz
+        self.espectral = espectral
+        self._analisador: Optional[SpectralAnalyzer] = None
+        self._nivel_a = 0.0
+        self._nivel_voz = 0.0
+        # VAD (src/audio_vad.py) e contadores para get_vad_stats()
+        self.vad = vad
+        self._vad: Optional[VoiceActivityDetector] = None
+        # Limite de strike atual: chunks nele ou acima nunca são retidos pelo VAD
+        self.limite_fala_db = limite_fala_db
+        self._ultimo_db_entregue: Optional[float] = None
+        self._ultima_entrega = 0.0
+        self._vad_stats = {"frames": 0, "frames_fala": 0, "frames_entregues": 0,
+                           "vad_segundos": 0.0, "downstream_segundos": 0.0, "downstream_frames": 0}
+        self.audio_log = audio_log
+        self._audio_log_offset: Optional[int] = None
         self._running = Event()
         self._thread: Optional[Thread] = None
-        self._historico_db = deque(maxlen=janela_segundos * 10)  # 10 amostras/segundo
+        # Modo economia: pedido pelo app, efetivo só sem assinantes (calibração)
+        self._economia_pedida = False
+        self._modo_mudou = Event()
+        self._energia_stats = {modo: {"segundos": 0.0, "wakeups": 0} for modo in ("normal", "economia")}
+        self._modo_atual = "normal"
+        self._modo_desde = 0.0
+        self._started = False  # start() explícito (app); senão a captura vive só enquanto houver assinantes
+        self._subscribers: Tuple[AudioSubscription, ...] = ()
+        self._subscribers_lock = Lock()
+        self._historico_db = RollingStats(janela_segundos * 10)  # 10 amostras/segundo
         self._nivel_atual = 0.0
-        self._pico_atual = 0.0
         
         self.CHUNK = 4410  # ~100ms at 44100Hz — keeps mic access continuous (no flickering)
-        self.FORMAT = pyaudio.paInt16
-        self.CHANNELS = 1
         self.RATE = 44100
         
-        self._pyaudio: Optional[pyaudio.PyAudio] = None
-        self._stream = None
+        # Buffer de trabalho reaproveitado a cada chunk (sem alocação por leitura)
+        self._scratch = np.empty(self.CHUNK, dtype=np.float64)
     
     def _calcular_db(self, data: bytes) -> float:
-        audio_data = np.frombuffer(data, dtype=np.int16).astype(np.float32)
-        if len(audio_data) == 0:
+        samples = np.frombuffer(data, dtype=np.int16)
+        n = len(samples)
+        if n == 0:
             return 0.0
-        rms = np.sqrt(np.mean(audio_data ** 2))
-        if rms < 1:
+        if n > len(self._scratch):
+            self._scratch = np.empty(n, dtype=np.float64)
+        buf = self._scratch[:n]
+        np.copyto(buf, samples)
+        # Soma dos quadrados via dot (BLAS). Em float64 é exata para int16:
+        # 32768² * n cabe nos 53 bits da mantissa para qualquer chunk realista
+        soma_quadrados = float(np.dot(buf, buf))
+        return _energia_para_db(soma_quadrados / n)
+    
+    def _calcular_pico_db(self, data: bytes) -> float:
+        samples = np.frombuffer(data, dtype=np.int16)
+        if len(samples) == 0:
             return 0.0
-        db = 20 * np.log10(rms / 32768.0) + 96
-        return max(0, min(120, db))
+        pico = max(int(samples.max()), -int(samples.min()))
+        return _energia_para_db(float(pico) ** 2)
     
-    def _monitor_loop(self):
+    def _registrar_features(self, db: float, fala: bool, data: bytes):
         try:
-            self._pyaudio = pyaudio.PyAudio()
-            self._stream = self._pyaudio.open(
-                format=self.FORMAT,
-                channels=self.CHANNELS,
-                rate=self.RATE,
-                input=True,
-                frames_per_buffer=self.CHUNK
+            self._audio_log_offset = self.audio_log.append(
+                db, self._nivel_voz if self.espectral else 0.0, self._calcular_pico_db(data), fala
             )
+        except (OSError, ValueError) as e:
+            # Disco cheio/arquivo inacessível: segue monitorando sem o log
+            print(f"Erro no log de features de áudio: {e}")
+            self.audio_log = None
+    
+    def _calcular_espectral(self, data: bytes):
+        samples = np.frombuffer(data, dtype=np.int16)
+        if len(samples) == 0:
+            return
+        if self._analisador is None or self._analisador.chunk != len(samples) \
+                or self._analisador.rate != self.RATE:
+            self._analisador = SpectralAnalyzer(self.RATE, len(samples))
+        energia_a, energia_voz = self._analisador.analisar(samples)
+        self._nivel_a = _energia_para_db(energia_a)
+        self._nivel_voz = _energia_para_db(energia_voz)
+    
+    def _classificar_fala(self, data: bytes, db: float) -> bool:
+        samples = np.frombuffer(data, dtype=np.int16)
+        if self._vad is None:
+            self._vad = VoiceActivityDetector(self.RATE)
+        
+        def planicidade() -> float:
+            if not self.espectral:  # com o estágio espectral ligado a FFT já rodou
+                self._calcular_espectral(data)
+            return self._analisador.planicidade() if self._analisador else 1.0
+        
+        limite = self.limite_fala_db() if self.limite_fala_db else None
+        return self._vad.classificar(samples, db, planicidade, limite)
+    
+    def _deve_entregar(self, db: float, fala: bool, agora: float) -> bool:
+        if fala or self._ultimo_db_entregue is None:
+            return True
+        if abs(db - self._ultimo_db_entregue) >= VAD_UI_DELTA_DB:
+            return True
+        return agora - self._ultima_entrega >= VAD_REFRESH_SECONDS
+    
+    def _economia_efetiva(self) -> bool:
+        return self._economia_pedida and not self._subscribers
+    
+    def _abrir_fonte(self, economia: bool) -> AudioSource:
+        if self.source:
+            source = self.source
+        elif economia:
+            source = PyAudioSource(ECONOMIA_RATE, ECONOMIA_CHUNK)
+        else:
+            source = PyAudioSource(44100, self.CHUNK)
+        self.RATE = source.rate
+        if self._vad:
+            self._vad.rate = source.rate
+        source.open()
+        return source
+    
+    def _trocar_modo(self, modo: str):
+        agora = time.monotonic()
+        if self._modo_desde:
+            self._energia_stats[self._modo_atual]["segundos"] += agora - self._modo_desde
+        self._modo_atual = modo
+        self._modo_desde = agora
+    
+    def _monitor_loop(self):
+        economia = self._economia_efetiva()
+        self._trocar_modo("economia" if economia else "normal")
+        source = None
+        fim_janela = time.monotonic() + ECONOMIA_ATIVO_SEGUNDOS
+        try:
+            source = self._abrir_fonte(economia)
             
             while self._running.is_set():
+                modo = self._modo_atual
                 try:
-                    data = self._stream.read(self.CHUNK, exception_on_overflow=False)
-                    db = self._calcular_db(data)
+                    if self._economia_efetiva() != economia:
+                        self._modo_mudou.clear()
+                        economia = not economia
+                        self._trocar_modo("economia" if economia else "normal")
+                        fim_janela = time.monotonic() + ECONOMIA_ATIVO_SEGUNDOS
+                        if not self.source:  # microfone: reabre com a nova taxa
+                            source.close()
+                            source = self._abrir_fonte(economia)
+                        continue
                     
-                    self._nivel_atual = db
-                    self._historico_db.append(db)
-                    
-                    if db >= self._pico_atual:
-                        self._pico_atual = db
-                    elif len(self._historico_db) == self._historico_db.maxlen:
-                        self._pico_atual = max(self._historico_db)
-                    
-                    if self.callback:
-                        media = self.get_media()
-                        self.callback(db, media, self._pico_atual)
+                    if economia and time.monotonic() >= fim_janela:
+                        source.pause()
+                        self._modo_mudou.wait(ECONOMIA_PAUSA_SEGUNDOS)
+                        self._modo_mudou.clear()
+                        source.resume()
+                        self._energia_stats[modo]["wakeups"] += 1
+                        fim_janela = time.monotonic() + ECONOMIA_ATIVO_SEGUNDOS
+                        continue
                     
+                    data = source.read()
+                    self._energia_stats[modo]["wakeups"] += 1
+                    if not data:
+                        break  # fim do replay
+                    self.process_chunk(data)
                 except Exception:
                     time.sleep(0.1)
                     
         except Exception as e:
             print(f"Erro no monitor de áudio: {e}")
         finally:
-            self._cleanup()
+            self._trocar_modo(self._modo_atual)
+            self._modo_desde = 0.0
+            if source:
+                source.close()
+            self._running.clear()
     
-    def _cleanup(self):
-        if self._stream:
-            try:
-                self._stream.stop_stream()
-                self._stream.close()
-            except Exception:
-                pass
-        if self._pyaudio:
-            try:
-                self._pyaudio.terminate()
-            except Exception:
-                pass
+    def set_economia(self, economia: bool):
+        """Liga/desliga o modo economia (PC ocioso ou bloqueado). Thread-safe."""
+        if economia != self._economia_pedida:
+            self._economia_pedida = economia
+            self._modo_mudou.set()
+    
+    def get_energia_stats(self) -> dict:
+        """Wakeups de captura por minuto em cada modo (normal x economia)."""
+        stats = {}
+        for modo, valores in self._energia_stats.items():
+            segundos = valores["segundos"]
+            if modo == self._modo_atual and self._modo_desde:
+                segundos += time.monotonic() - self._modo_desde
+            minutos = segundos / 60
+            stats[modo] = {
+                "minutos": round(minutos, 2),
+                "wakeups_por_minuto": round(valores["wakeups"] / minutos, 1) if minutos > 0 else None,
+            }
+        return stats
+    
+    def process_chunk(self, data: bytes) -> float:
+        """Processa um chunk int16 (~100ms): dB, histórico, callback e assinantes."""
+        db = self._calcular_db(data)
+        if self.espectral:
+            self._calcular_espectral(data)
+        
+        self._nivel_atual = db
+        self._historico_db.append(db)
+        
+        fala = True
+        entregar = True
+        if self.vad:
+            inicio = time.perf_counter()
+            fala = self._classificar_fala(data, db)
+            agora = time.monotonic()
+            entregar = self._deve_entregar(db, fala, agora)
+            stats = self._vad_stats
+            stats["vad_segundos"] += time.perf_counter() - inicio
+            stats["frames"] += 1
+            stats["frames_fala"] += fala
+            if entregar:
+                stats["frames_entregues"] += 1
+                self._ultimo_db_entregue = db
+                self._ultima_entrega = agora
+        
+        if self.audio_log:
+            self._registrar_features(db, fala, data)
+        
+        if self.callback and entregar:
+            self.callback(db, self._historico_db.media, self._historico_db.maximo, fala)
+        
+        if self._subscribers:
+            agora = time.time()
+            for sub in self._subscribers:
+                sub._publish((agora, db, data) if sub.frames else (agora, db))
+        return db
+    
+    def run(self):
+        """Roda a captura na thread atual até a fonte acabar ou stop() (replay/benchmark)."""
+        self._running.set()
+        self._monitor_loop()
     
     def start(self):
+        self._started = True
+        self._start_capture()
+    
+    def stop(self):
+        self._started = False
+        if not self._subscribers:
+            self._stop_capture()
+    
+    def _start_capture(self):
         if self._thread and self._thread.is_alive():
             return
         self._running.set()
         self._thread = Thread(target=self._monitor_loop, daemon=True)
         self._thread.start()
     
-    def stop(self):
+    def _stop_capture(self):
         self._running.clear()
+        self._modo_mudou.set()
         if self._thread:
             self._thread.join(timeout=2)
     
+    def subscribe(self, maxsize: int = 50, frames: bool = False) -> AudioSubscription:
+        """Assina o barramento de captura (liga o microfone se ainda não estiver ligado).
+        
+        Feche com subscription.close() quando não precisar mais.
+        """
+        sub = AudioSubscription(self, maxsize, frames)
+        with self._subscribers_lock:
+            self._subscribers = self._subscribers + (sub,)
+        self._modo_mudou.set()  # assinante sempre recebe captura normal
+        self._start_capture()
+        return sub
+    
+    def unsubscribe(self, sub: AudioSubscription):
+        with self._subscribers_lock:
+            self._subscribers = tuple(s for s in self._subscribers if s is not sub)
+            vazio = not self._subscribers
+        if vazio and self._economia_pedida:
+            self._modo_mudou.set()
+        if vazio and not self._started:
+            self._stop_capture()
+    
     def get_nivel_atual(self) -> float:
         return self._nivel_atual
     
+    def get_nivel_a(self) -> Optional[float]:
+        """dB ponderado A do último chunk (None com o estágio espectral desligado)."""
+        return self._nivel_a if self.espectral else None
+    
+    def get_nivel_voz(self) -> Optional[float]:
+        """dB na banda de voz (300–3400 Hz) do último chunk (None se desligado)."""
+        return self._nivel_voz if self.espectral else None
+    
+    def get_audio_log_offset(self) -> Optional[int]:
+        """Offset (seq) do último registro no log de features, ou None sem log."""
+        return self._audio_log_offset if self.audio_log else None
+    
+    def registrar_custo_downstream(self, segundos: float):
+        """O consumidor do callback informa quanto custou processar um chunk
+        (UI + strikes), para estimar a CPU economizada pelo VAD.
+        """
+        self._vad_stats["downstream_segundos"] += segundos
+        self._vad_stats["downstream_frames"] += 1
+    
+    def get_vad_stats(self) -> dict:
+        """Fração de chunks sem fala / não entregues e CPU líquida economizada."""
+        stats = dict(self._vad_stats)
+        frames = stats["frames"]
+        if not frames:
+            return stats
+        retidos = frames - stats["frames_entregues"]
+        custo_medio = stats["downstream_segundos"] / stats["downstream_frames"] if stats["downstream_frames"] else 0.0
+        stats["fracao_sem_fala"] = round(1 - stats["frames_fala"] / frames, 3)
+        stats["fracao_retida"] = round(retidos / frames, 3)
+        stats["vad_us_por_frame"] = round(stats["vad_segundos"] / frames * 1e6, 1)
+        stats["cpu_economizada_segundos"] = round(retidos * custo_medio - stats["vad_segundos"], 3)
+        return stats
+    
     def get_media(self) -> float:
-        if len(self._historico_db) == 0:
-            return 0.0
-        return sum(self._historico_db) / len(self._historico_db)
+        return self._historico_db.media
     
     def get_pico(self) -> float:
-        return self._pico_atual
+        return self._historico_db.maximo
+    
+    def get_percentil(self, p: float) -> float:
+        """Percentil p (0-100) do dB na janela, ex: 50 (mediana) ou 95."""
+        return self._historico_db.percentil(p)
     
     def reset_historico(self):
         self._historico_db.clear()
-        self._pico_atual = 0.0
     
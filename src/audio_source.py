@@ -0,0 +1,189 @@
+"""Fontes de áudio para o AudioMonitor.
+
+O monitor só precisa de chunks int16 mono de ~100ms. A fonte padrão é o
+microfone (PyAudio); WAV e sintética permitem rodar o pipeline inteiro
+(dB → strikes) sem microfone, em tempo real ou acelerado.
+"""
+
+import math
+import time
+import wave
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+
+class AudioSource:
+    """Interface: open(), read() → bytes int16 mono (b"" = fim), close().
+
+    pause()/resume() suspendem a captura entre janelas do modo economia.
+    """
+
+    def __init__(self, rate: int = 44100, chunk: Optional[int] = None):
+        self.rate = rate
+        self.chunk = chunk or rate // 10  # 100ms
+
+    def open(self):
+        pass
+
+    def read(self) -> bytes:
+        raise NotImplementedError
+
+    def pause(self):
+        pass
+
+    def resume(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class PyAudioSource(AudioSource):
+    """Microfone padrão do sistema."""
+
+    def __init__(self, rate: int = 44100, chunk: Optional[int] = None):
+        super().__init__(rate, chunk)
+        self._pyaudio = None
+        self._stream = None
+
+    def open(self):
+        import pyaudio
+        self._pyaudio = pyaudio.PyAudio()
+        self._stream = self._pyaudio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.rate,
+            input=True,
+            frames_per_buffer=self.chunk
+        )
+
+    def read(self) -> bytes:
+        return self._stream.read(self.chunk, exception_on_overflow=False)
+
+    def pause(self):
+        # Para o stream: o driver deixa de entregar buffers (sem wakeups)
+        self._stream.stop_stream()
+
+    def resume(self):
+        self._stream.start_stream()
+
+    def close(self):
+        if self._stream:
+            try:
+                self._stream.stop_stream()
+                self._stream.close()
+            except Exception:
+                pass
+            self._stream = None
+        if self._pyaudio:
+            try:
+                self._pyaudio.terminate()
+            except Exception:
+                pass
+            self._pyaudio = None
+
+
+class _PacedSource(AudioSource):
+    """Base das fontes de replay: speed=1 tempo real, N = N vezes mais rápido, 0 = sem espera."""
+
+    def __init__(self, rate: int, chunk: Optional[int] = None, speed: float = 1.0):
+        super().__init__(rate, chunk)
+        self.speed = speed
+        self._next_deadline = 0.0
+
+    def open(self):
+        self._next_deadline = time.monotonic()
+
+    def _pace(self):
+        if self.speed <= 0:
+            return
+        self._next_deadline += self.chunk / self.rate / self.speed
+        delay = self._next_deadline - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class WavFileSource(_PacedSource):
+    """Replay de um arquivo WAV PCM 16-bit (multicanal usa só o primeiro canal)."""
+
+    def __init__(self, path, speed: float = 1.0, loop: bool = False):
+        self.path = Path(path)
+        with wave.open(str(self.path), "rb") as wav:
+            if wav.getsampwidth() != 2:
+                raise ValueError(f"{self.path}: só WAV 16-bit é suportado")
+            rate = wav.getframerate()
+            self.channels = wav.getnchannels()
+            self.duracao_segundos = wav.getnframes() / rate
+        super().__init__(rate, speed=speed)
+        self.loop = loop
+        self._wav: Optional[wave.Wave_read] = None
+
+    def open(self):
+        super().open()
+        self._wav = wave.open(str(self.path), "rb")
+
+    def read(self) -> bytes:
+        data = self._wav.readframes(self.chunk)
+        if not data and self.loop:
+            self._wav.rewind()
+            data = self._wav.readframes(self.chunk)
+        if data and self.channels > 1:
+            data = np.frombuffer(data, dtype=np.int16)[::self.channels].tobytes()
+        if data:
+            self._pace()
+        return data
+
+    def close(self):
+        if self._wav:
+            self._wav.close()
+            self._wav = None
+
+
+class SyntheticSource(_PacedSource):
+    """Gerador determinístico: ruído de fundo + fala (tom modulado) + gritos esporádicos.
+
+    `cenario` define as amplitudes: "silencio", "sala" (conversa com gritos
+    ocasionais) ou "grito" (gritos frequentes). duracao_segundos=None gera
+    para sempre.
+    """
+
+    CENARIOS = {
+        # ruído de fundo, fala, grito, probabilidade de grito por chunk
+        "silencio": (30, 0, 0, 0.0),
+        "sala": (150, 2500, 20000, 0.003),
+        "grito": (150, 0, 20000, 0.05),
+    }
+
+    def __init__(self, cenario: str = "sala", duracao_segundos: Optional[float] = None,
+                 rate: int = 44100, speed: float = 1.0, seed: int = 0):
+        super().__init__(rate, speed=speed)
+        self.ruido, self.fala, self.grito, self.prob_grito = self.CENARIOS[cenario]
+        self.duracao_segundos = duracao_segundos
+        self._rng = np.random.default_rng(seed)
+        self._t = np.arange(self.chunk) / rate
+        self._chunks_emitidos = 0
+        self._grito_restante = 0
+
+    def read(self) -> bytes:
+        if self.duracao_segundos is not None and \
+                self._chunks_emitidos * self.chunk >= self.duracao_segundos * self.rate:
+            return b""
+        sinal = self._rng.standard_normal(self.chunk) * self.ruido
+        if self.fala:
+            # Fala: 200Hz + harmônicos, envelope silábico de ~4Hz, ativa metade do tempo
+            inicio = self._chunks_emitidos * self.chunk / self.rate
+            if math.sin(2 * math.pi * 0.05 * inicio) > 0:
+                t = self._t + inicio
+                env = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+                voz = sum(np.sin(2 * np.pi * 200 * k * t) / k for k in range(1, 6))
+                sinal += self.fala * env * voz
+        if self._grito_restante == 0 and self._rng.random() < self.prob_grito:
+            self._grito_restante = 10  # ~1s
+        if self._grito_restante:
+            self._grito_restante -= 1
+            sinal += self.grito * np.sin(2 * np.pi * 600 * self._t)
+        self._chunks_emitidos += 1
+        self._pace()
+        return np.clip(sinal, -32768, 32767).astype(np.int16).tobytes()
@@ -0,0 +1,84 @@
+"""Estágio espectral opcional do AudioMonitor.
+
+Uma FFT real por chunk dá dois níveis além do RMS de banda larga:
+- ponderado A (como um decibelímetro: ventoinha e graves pesam menos)
+- banda de voz (300–3400 Hz: fala/grito, sem teclado agudo nem zumbido)
+
+Janela e tabelas de ponderação são pré-calculadas uma vez; cada chunk faz
+janela → rfft → |X|² → dois produtos escalares, em buffers reaproveitados.
+A FFT usa a maior potência de 2 que cabe no chunk (4096 de 4410 amostras):
+metade do custo de uma FFT de 4410 pontos, e a energia média é a mesma.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+VOZ_MIN_HZ = 300.0
+VOZ_MAX_HZ = 3400.0
+
+
+def _ganho_a(freqs: np.ndarray) -> np.ndarray:
+    """Ganho de potência da curva A (IEC 61672), 1.0 em 1 kHz."""
+    f2 = freqs ** 2
+    ra = (12194.0 ** 2 * f2 ** 2) / (
+        (f2 + 20.6 ** 2)
+        * np.sqrt((f2 + 107.7 ** 2) * (f2 + 737.9 ** 2))
+        * (f2 + 12194.0 ** 2)
+    )
+    return (ra ** 2) * 10 ** (2.0 / 10)  # +2.00 dB normaliza 1 kHz
+
+
+class SpectralAnalyzer:
+    """Energia média (amostra²) ponderada A e na banda de voz de um chunk int16."""
+
+    def __init__(self, rate: int, chunk: int):
+        self.rate = rate
+        self.chunk = chunk
+        self.n_fft = 1 << (chunk.bit_length() - 1)
+        n = self.n_fft
+        self._janela = np.hanning(n)
+        freqs = np.fft.rfftfreq(n, 1.0 / rate)
+
+        # Parseval para rfft janelada: bins internos contam duas vezes e a
+        # soma é normalizada por N·Σw², então um tom puro dá o mesmo RMS
+        # que no domínio do tempo
+        dobra = np.full(len(freqs), 2.0)
+        dobra[0] = 1.0
+        if n % 2 == 0:
+            dobra[-1] = 1.0
+        escala = dobra / (n * np.sum(self._janela ** 2))
+        voz = (freqs >= VOZ_MIN_HZ) & (freqs <= VOZ_MAX_HZ)
+
+        self._tabela_a = escala * _ganho_a(freqs)
+        self._tabela_voz = escala * voz
+        idx_voz = np.flatnonzero(voz)
+        self._voz = slice(idx_voz[0], idx_voz[-1] + 1)
+        self._log = np.empty(len(idx_voz), dtype=np.float64)
+
+        self._buf = np.empty(n, dtype=np.float64)
+        self._potencia = np.empty(len(freqs), dtype=np.float64)
+        self._tmp = np.empty(len(freqs), dtype=np.float64)
+
+    def analisar(self, samples: np.ndarray) -> Tuple[float, float]:
+        """Retorna (energia ponderada A, energia na banda de voz) do chunk."""
+        if len(samples) != self.chunk:
+            return 0.0, 0.0
+        np.multiply(samples[:self.n_fft], self._janela, out=self._buf)
+        espectro = np.fft.rfft(self._buf)
+        np.square(espectro.real, out=self._potencia)
+        np.square(espectro.imag, out=self._tmp)
+        self._potencia += self._tmp
+        return float(np.dot(self._potencia, self._tabela_a)), float(np.dot(self._potencia, self._tabela_voz))
+
+    def planicidade(self) -> float:
+        """Planicidade espectral (média geométrica / aritmética) da banda de voz
+        do último chunk analisado: ~0 para sons tonais, ~0.5+ para ruído.
+        """
+        banda = self._potencia[self._voz]
+        media = float(np.mean(banda))
+        if media <= 0:
+            return 1.0
+        np.add(banda, 1e-12, out=self._log)
+        np.log(self._log, out=self._log)
+        return float(np.exp(np.mean(self._log))) / media
@@ -0,0 +1,87 @@
+"""Estatísticas da janela deslizante de dB do AudioMonitor.
+
+Tudo O(1) por amostra: ring buffer com soma corrente (média), deque
+monotônico (máximo da janela) e histograma de bins fixos (percentis).
+A consulta de percentil percorre um número fixo de bins, independente do
+tamanho da janela.
+"""
+
+import math
+from collections import deque
+from threading import Lock
+from typing import List
+
+# Resolução dos percentis (largura do bin) e faixa de dB do monitor
+HIST_BIN_DB = 0.5
+HIST_MAX_DB = 120.0
+
+
+class RollingStats:
+    """Janela deslizante de `tamanho` amostras com média, máximo e percentis."""
+
+    def __init__(self, tamanho: int, bin_db: float = HIST_BIN_DB, max_db: float = HIST_MAX_DB):
+        self.tamanho = max(1, tamanho)
+        self.bin_db = bin_db
+        self._num_bins = int(max_db / bin_db) + 1
+        self._lock = Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._valores: List[float] = [0.0] * self.tamanho
+            self._pos = 0          # próxima posição de escrita no ring
+            self._count = 0
+            self._seq = 0          # nº total de amostras (índice para o deque do máximo)
+            self._soma = 0.0
+            self._maximos: deque = deque()  # (seq, valor), valores decrescentes
+            self._hist = [0] * self._num_bins
+            self.media = 0.0
+            self.maximo = 0.0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _bin(self, valor: float) -> int:
+        return min(self._num_bins - 1, max(0, int(valor / self.bin_db)))
+
+    def append(self, valor: float):
+        with self._lock:
+            if self._count == self.tamanho:
+                antigo = self._valores[self._pos]
+                self._soma -= antigo
+                self._hist[self._bin(antigo)] -= 1
+            else:
+                self._count += 1
+
+            self._valores[self._pos] = valor
+            self._soma += valor
+            self._hist[self._bin(valor)] += 1
+            self._pos += 1
+            if self._pos == self.tamanho:
+                self._pos = 0
+                # Ressincroniza a soma uma vez por volta (erro de float acumulado)
+                self._soma = math.fsum(self._valores[:self._count])
+
+            while self._maximos and self._maximos[-1][1] <= valor:
+                self._maximos.pop()
+            self._maximos.append((self._seq, valor))
+            if self._maximos[0][0] <= self._seq - self.tamanho:
+                self._maximos.popleft()
+            self._seq += 1
+
+            # Publicados como atributos: leitura de outra thread sem lock
+            self.media = self._soma / self._count
+            self.maximo = self._maximos[0][1]
+
+    def percentil(self, p: float) -> float:
+        """Percentil p (0-100) da janela, com resolução de bin_db (centro do bin)."""
+        with self._lock:
+            if self._count == 0:
+                return 0.0
+            alvo = max(1, math.ceil(p / 100.0 * self._count))
+            acumulado = 0
+            for i, n in enumerate(self._hist):
+                acumulado += n
+                if acumulado >= alvo:
+                    return (i + 0.5) * self.bin_db
+            return (self._num_bins - 0.5) * self.bin_db
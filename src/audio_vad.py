@@ -0,0 +1,71 @@
+"""Detector de atividade de voz (VAD) leve do AudioMonitor.
+
+Marca cada chunk como fala ou não-fala em três testes, do mais barato ao
+mais caro, parando no primeiro que reprova:
+1. energia: dB acima do piso de ruído adaptativo + margem
+2. taxa de cruzamentos por zero: fala tem frequência dominante < ~3 kHz
+   (chiado, teclado e ventoinha cruzam muito mais)
+3. planicidade espectral na banda de voz: fala é tonal (harmônicos),
+   ruído é plano — só calculada se os dois primeiros passarem
+
+Buffers de trabalho são reaproveitados; não há alocação por chunk nos
+testes 1 e 2.
+"""
+
+from typing import Callable, Optional
+
+import numpy as np
+
+MARGEM_PISO_DB = 6.0
+SUBIDA_PISO_DB = 0.02      # por chunk sem fala (~0.2 dB/s): o piso sobe devagar, cai na hora
+ZCR_MAX_HZ = 3000.0
+PLANICIDADE_MAX = 0.4      # ruído branco janelado fica em ~0.5-0.6
+
+
+class VoiceActivityDetector:
+    """Classifica chunks int16 como fala (True) ou não-fala (False)."""
+
+    def __init__(self, rate: int):
+        self.rate = rate
+        self.piso_db = None
+        self._sinal = np.empty(0, dtype=bool)
+        self._cruzou = np.empty(0, dtype=bool)
+
+    def _subir_piso(self, db: float):
+        self.piso_db = min(db, self.piso_db + SUBIDA_PISO_DB)
+    
+    def _zcr_hz(self, samples: np.ndarray) -> float:
+        n = len(samples)
+        if len(self._sinal) != n:
+            self._sinal = np.empty(n, dtype=bool)
+            self._cruzou = np.empty(n - 1, dtype=bool)
+        np.signbit(samples, out=self._sinal)
+        np.not_equal(self._sinal[1:], self._sinal[:-1], out=self._cruzou)
+        # Duas passagens por zero por ciclo
+        return np.count_nonzero(self._cruzou) * self.rate / (2.0 * n)
+
+    def classificar(self, samples: np.ndarray, db: float,
+                    planicidade: Callable[[], float],
+                    limite_db: Optional[float] = None) -> bool:
+        """`planicidade` só é chamada se energia e ZCR indicarem fala.
+        
+        Chunks em `limite_db` ou acima (limite de strike) são sempre fala:
+        nenhum teste os retém. O piso só sobe com chunks sem fala, então
+        conversa contínua não eleva o piso até o nível da própria voz.
+        """
+        if len(samples) < 2:
+            return False
+        if limite_db is not None and db >= limite_db:
+            return True
+        if self.piso_db is None:
+            self.piso_db = db
+        elif db < self.piso_db:
+            self.piso_db = db  # cai na hora
+            return False
+        elif db < self.piso_db + MARGEM_PISO_DB:
+            self._subir_piso(db)
+            return False
+        fala = bool(self._zcr_hz(samples) <= ZCR_MAX_HZ and planicidade() < PLANICIDADE_MAX)
+        if not fala:
+            self._subir_piso(db)
+        return fala
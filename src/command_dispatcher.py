@@ -0,0 +1,131 @@
+"""Despacho de comandos remotos (painel → PC).
+
+Handlers são registrados por nome de comando e rodam fora da thread do sync,
+em "lanes": cada lane é uma thread própria, então comandos da mesma lane
+(lock → unlock) mantêm a ordem e um comando lento (shutdown) não segura os
+outros. O status executed/failed fica acumulado até o RemoteSync enviar
+tudo de uma vez (take_acks), e a latência created_at → executado é medida
+por tipo de comando.
+"""
+
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_LANE = "state"
+# Ids já despachados lembrados para não executar duas vezes (push + polling)
+SEEN_IDS_MAX = 500
+# Latência acima disso gera aviso no log
+LATENCY_WARN_SECONDS = 60
+
+
+class CommandDispatcher:
+    """Registry de handlers + pool de workers por lane + acks em lote."""
+
+    def __init__(self, on_done: Optional[Callable[[Dict[str, Any], str], None]] = None):
+        self.on_done = on_done
+        self._handlers: Dict[str, tuple] = {}            # command → (handler, lane)
+        self._lanes: Dict[str, ThreadPoolExecutor] = {}
+        self._lock = Lock()
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._acks: Dict[str, List[str]] = {"executed": [], "failed": []}
+        self._latency: Dict[str, deque] = {}             # command → últimas latências (s)
+        self._counts: Dict[str, Dict[str, int]] = {}     # command → {executed, failed}
+
+    def register(self, command: str, handler: Callable[[Dict[str, Any]], None], lane: str = DEFAULT_LANE):
+        """Registra o handler de um comando. O handler recebe o payload."""
+        self._handlers[command] = (handler, lane)
+
+    def dispatch(self, cmd: Dict[str, Any]) -> bool:
+        """Agenda um comando. Retorna False se o id já foi despachado."""
+        cmd_id = cmd.get("id")
+        with self._lock:
+            if cmd_id in self._seen:
+                return False
+            self._seen[cmd_id] = None
+            while len(self._seen) > SEEN_IDS_MAX:
+                self._seen.popitem(last=False)
+
+        _, lane = self._handlers.get(cmd.get("command"), (None, DEFAULT_LANE))
+        with self._lock:
+            if lane not in self._lanes:
+                self._lanes[lane] = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"cmd-{lane}")
+            self._lanes[lane].submit(self._run, cmd)
+        return True
+
+    def _run(self, cmd: Dict[str, Any]):
+        command = cmd.get("command", "")
+        handler, _ = self._handlers.get(command, (None, None))
+        status = "executed"
+        try:
+            if handler:
+                handler(cmd.get("payload", {}) or {})
+            else:
+                # Sem handler nesta versão: o painel não deve mostrar como aplicado
+                print(f"CommandDispatcher: comando desconhecido '{command}'")
+                status = "failed"
+        except Exception as e:
+            print(f"Erro ao executar comando {command}: {e}")
+            status = "failed"
+
+        self._record(cmd, status)
+        if self.on_done:
+            try:
+                self.on_done(cmd, status)
+            except Exception as e:
+                print(f"CommandDispatcher: erro no callback: {e}")
+
+    def _record(self, cmd: Dict[str, Any], status: str):
+        command = cmd.get("command", "")
+        latency = None
+        try:
+            created = datetime.fromisoformat(cmd["created_at"].replace("Z", "+00:00"))
+            latency = (datetime.now(timezone.utc) - created).total_seconds()
+        except Exception:
+            pass
+
+        with self._lock:
+            self._acks[status].append(cmd.get("id"))
+            counts = self._counts.setdefault(command, {"executed": 0, "failed": 0})
+            counts[status] += 1
+            if latency is not None:
+                self._latency.setdefault(command, deque(maxlen=100)).append(latency)
+
+        if latency is not None and latency > LATENCY_WARN_SECONDS:
+            print(f"CommandDispatcher: comando {command} levou {latency:.0f}s para ser aplicado")
+
+    def take_acks(self) -> Dict[str, List[str]]:
+        """Retira os status pendentes de envio ({status: [ids]})."""
+        with self._lock:
+            acks = self._acks
+            self._acks = {"executed": [], "failed": []}
+        return acks
+
+    def restore_acks(self, acks: Dict[str, List[str]]):
+        """Devolve acks que não foram enviados (ex: falha de rede)."""
+        with self._lock:
+            for status, ids in acks.items():
+                self._acks[status][:0] = ids
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Por comando: executados, falhas e latência (média, p95, máx) em segundos."""
+        with self._lock:
+            stats = {}
+            for command, counts in self._counts.items():
+                samples = sorted(self._latency.get(command, ()))
+                entry: Dict[str, Any] = dict(counts)
+                if samples:
+                    entry["latency_avg"] = round(sum(samples) / len(samples), 2)
+                    entry["latency_p95"] = round(samples[int(0.95 * (len(samples) - 1))], 2)
+                    entry["latency_max"] = round(samples[-1], 2)
+                stats[command] = entry
+            return stats
+
+    def shutdown(self):
+        """Encerra as lanes; um dispatch() depois disso cria lanes novas."""
+        with self._lock:
+            lanes, self._lanes = self._lanes, {}
+        for lane in lanes.values():
+            lane.shutdown(wait=False)
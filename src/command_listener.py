@@ -0,0 +1,163 @@
+"""Canal push de comandos via Supabase Realtime (websocket).
+
+Assina INSERTs em `commands` filtrados pelo pc_id e acorda a thread do
+RemoteSync assim que o pai envia um comando. Se o socket cair, o RemoteSync
+volta ao polling normal até a reconexão.
+
+Só conta como conectado depois que o Realtime confirma a assinatura
+postgres_changes (evento `system` com status ok). Socket meio aberto
+(sleep/resume, troca de Wi-Fi) é detectado pelo heartbeat: sem resposta em
+2×HEARTBEAT_SECONDS a conexão é derrubada. O backoff de reconexão só volta
+a 1s depois que um heartbeat foi respondido com a assinatura ativa, então
+um canal que cai logo após entrar não reconecta a cada segundo.
+"""
+
+import asyncio
+import json
+import time
+from threading import Thread, Event
+from typing import Callable, Optional
+
+# Phoenix exige heartbeat a cada <60s, senão o servidor fecha o socket
+HEARTBEAT_SECONDS = 25
+MAX_RECONNECT_SECONDS = 60
+
+
+class CommandListener:
+    """Cliente Realtime mínimo (protocolo Phoenix v1) para a tabela commands."""
+
+    def __init__(self, url: str, api_key: str, access_token: str, pc_id: str,
+                 on_command: Callable[[dict], None],
+                 on_state: Optional[Callable[[bool], None]] = None):
+        self.url = f"{url}?apikey={api_key}&vsn=1.0.0"
+        self.access_token = access_token
+        self.pc_id = pc_id
+        self.on_command = on_command
+        self.on_state = on_state
+
+        self._running = Event()
+        self._connected = Event()
+        self._thread: Optional[Thread] = None
+        self._ref = 0
+        self._heartbeat_pendente: Optional[tuple] = None  # (ref, enviado_em)
+        self._saudavel = False  # heartbeat respondido com a assinatura ativa
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._running.set()
+        self._thread = Thread(target=self._thread_main, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running.clear()
+        if self._thread:
+            self._thread.join(timeout=3)
+
+    def is_connected(self) -> bool:
+        return self._connected.is_set()
+
+    def _thread_main(self):
+        try:
+            import websockets
+        except ImportError:
+            print("CommandListener: websockets indisponível, usando só polling")
+            return
+        asyncio.run(self._run(websockets))
+
+    def _set_connected(self, connected: bool):
+        if connected == self._connected.is_set():
+            return
+        if connected:
+            self._connected.set()
+        else:
+            self._connected.clear()
+        if self.on_state:
+            try:
+                self.on_state(connected)
+            except Exception as e:
+                print(f"CommandListener: erro no callback de estado: {e}")
+
+    def _message(self, topic: str, event: str, payload: dict) -> str:
+        self._ref += 1
+        return json.dumps({"topic": topic, "event": event, "payload": payload, "ref": str(self._ref)})
+
+    async def _run(self, websockets):
+        """Conecta, assina e reconecta com backoff até stop()."""
+        backoff = 1
+        topic = f"realtime:kidspc-commands-{self.pc_id}"
+        while self._running.is_set():
+            try:
+                async with websockets.connect(self.url, ping_interval=None, open_timeout=10) as ws:
+                    await ws.send(self._message(topic, "phx_join", {
+                        "config": {
+                            "broadcast": {"self": False},
+                            "presence": {"key": ""},
+                            "postgres_changes": [{
+                                "event": "INSERT",
+                                "schema": "public",
+                                "table": "commands",
+                                "filter": f"pc_id=eq.{self.pc_id}",
+                            }],
+                        },
+                        "access_token": self.access_token,
+                    }))
+                    await self._listen(ws, topic)
+            except Exception as e:
+                if self._saudavel:
+                    backoff = 1
+                print(f"CommandListener: conexão perdida ({e}), reconectando em {backoff}s")
+            finally:
+                self._saudavel = False
+                self._set_connected(False)
+
+            for _ in range(backoff * 2):
+                if not self._running.is_set():
+                    break
+                await asyncio.sleep(0.5)
+            backoff = min(backoff * 2, MAX_RECONNECT_SECONDS)
+
+    async def _listen(self, ws, topic: str):
+        # recv com timeout curto para stop() não ficar preso esperando o socket
+        next_heartbeat = time.monotonic() + HEARTBEAT_SECONDS
+        self._heartbeat_pendente = None
+        self._saudavel = False
+        while self._running.is_set():
+            agora = time.monotonic()
+            pendente = self._heartbeat_pendente
+            if pendente and agora - pendente[1] > 2 * HEARTBEAT_SECONDS:
+                raise ConnectionError("heartbeat sem resposta")
+            if agora >= next_heartbeat:
+                await ws.send(self._message("phoenix", "heartbeat", {}))
+                if not pendente:
+                    self._heartbeat_pendente = (str(self._ref), agora)
+                next_heartbeat = agora + HEARTBEAT_SECONDS
+            try:
+                raw = await asyncio.wait_for(ws.recv(), timeout=1)
+            except asyncio.TimeoutError:
+                continue
+
+            msg = json.loads(raw)
+            event = msg.get("event")
+            payload = msg.get("payload") or {}
+
+            if event == "phx_reply" and msg.get("topic") == "phoenix":
+                pendente = self._heartbeat_pendente
+                if pendente and msg.get("ref") == pendente[0] and payload.get("status") == "ok":
+                    self._heartbeat_pendente = None
+                    self._saudavel = self._connected.is_set()
+            elif event == "phx_reply" and msg.get("topic") == topic:
+                # Join aceito; conectado só quando a assinatura for confirmada
+                if payload.get("status") != "ok":
+                    raise ConnectionError(f"join recusado: {payload.get('response')}")
+            elif event == "postgres_changes":
+                record = (payload.get("data") or {}).get("record") or {}
+                self.on_command(record)
+            elif event == "system":
+                # Realtime avisa se a assinatura postgres_changes entrou ou falhou
+                if payload.get("status") == "error":
+                    raise ConnectionError(f"assinatura recusada: {payload.get('message')}")
+                if payload.get("status") == "ok" and payload.get("extension") == "postgres_changes":
+                    self._set_connected(True)
+            elif event in ("phx_error", "phx_close"):
+                raise ConnectionError(event)
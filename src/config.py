@@ -15,6 +15,11 @@ class Config:
         # Volume (local config - criança não muda, pai ajusta no programa)
         "volume_atencao_db": 70,   # nível de atenção (aviso visual)
         "volume_grito_db": 85,     # nível de strike (grito)
+        "strike_metrica": "rms",   # "rms" (banda larga), "voz" (300–3400 Hz) ou "a" (ponderado A)
+        "vad_enabled": False,      # filtro de fala antes dos strikes: no benchmark custa CPU e não muda strikes
+        "audio_economia_enabled": True,  # captura 16 kHz intermitente com PC ocioso/bloqueado
+        "audio_log_enabled": True, # features por chunk em audio_features.bin (~12 bytes/100ms)
+        "audio_log_dias": 7,       # tamanho do ring: 7 dias ≈ 73 MB
         # Controle de tempo (vem da web via sync)
         "daily_limit_minutes": 120,
         "strike_penalty_minutes": 30,
@@ -39,6 +44,9 @@ class Config:
         # Sync remoto
         "remote_sync_enabled": True,
         "sync_interval_seconds": 30,
+        "realtime_commands_enabled": True,
+        "sync_rpc_enabled": True,
+        "heartbeat_keepalive_seconds": 75,  # intervalo máximo entre heartbeats (painel: offline após 90s)
     }
     
     def __init__(self):
@@ -3,7 +3,7 @@ import os
 import threading
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 class EventLogger:
     def __init__(self):
@@ -44,21 +44,24 @@ class EventLogger:
             if self._dirty:
                 self.save()
     
-    def registrar(self, tipo: str, descricao: str, nivel_db: float = 0):
+    def registrar(self, tipo: str, descricao: str, nivel_db: float = 0, audio_offset: Optional[int] = None):
         evento = {
             "timestamp": datetime.now().isoformat(),
             "tipo": tipo,
             "descricao": descricao,
             "nivel_db": round(nivel_db, 1)
         }
+        if audio_offset is not None:
+            # Registro no log de features (AudioFeatureLog.ler_ao_redor)
+            evento["audio_offset"] = audio_offset
         with self._lock:
             self._eventos.append(evento)
             if len(self._eventos) > 1000:
                 self._eventos = self._eventos[-1000:]
             self._dirty = True
     
-    def strike(self, numero: int, nivel_db: float):
-        self.registrar("strike", f"Strike {numero} aplicado", nivel_db)
+    def strike(self, numero: int, nivel_db: float, audio_offset: Optional[int] = None):
+        self.registrar("strike", f"Strike {numero} aplicado", nivel_db, audio_offset)
     
     def reinicio(self, nivel_db: float):
         self.registrar("reinicio", "PC reiniciado por excesso de barulho", nivel_db)
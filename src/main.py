@@ -2,7 +2,9 @@ import sys
 import os
 import atexit
 import signal
+import time
 from pathlib import Path
+from typing import Optional
 
 __version__ = "2.4.3"
 
@@ -14,6 +16,7 @@ from PyQt5.QtCore import QTimer, QObject, pyqtSignal
 from src.config import Config
 from src.logger import EventLogger
 from src.audio_monitor import AudioMonitor
+from src.audio_log import AudioFeatureLog
 from src.strike_manager import StrikeManager, StrikeAction
 from src.actions import Actions
 from src.activity_tracker import ActivityTracker
@@ -25,16 +28,22 @@ from src.ui.time_warning_popup import TimeWarningPopup, TimePenaltyPopup, TimeBl
 from src.ui.parent_auth_popup import ParentAuthPopup
 from src.tray_app import TrayApp
 from src.remote_sync import RemoteSync
+from src.outbox import Outbox
 from src.auto_updater import AutoUpdater
 from src.app_blocker import AppBlocker
+from src.process_cache import ProcessCache
 from src.site_blocker import SiteBlocker
 from src.window_tracker import WindowTracker
 from src.browser_history import BrowserHistory
 
 
+# O medidor puxa o último nível do áudio no máximo a esta taxa
+AUDIO_UI_FPS = 10
+
+
 class AudioSignals(QObject):
     """Sinais para comunicação thread-safe entre AudioMonitor e UI."""
-    audio_update = pyqtSignal(float, float, float)
+    strike_action = pyqtSignal(object, float)  # StrikeAction, nivel_db
     command_executed = pyqtSignal(str, dict)
     unpair_triggered = pyqtSignal()
 
@@ -59,17 +68,37 @@ class KidsPC:
         self.time_manager = TimeManager(self.config, self.activity_tracker)
         self.screen_locker = ScreenLocker()
         self.auto_updater = AutoUpdater(current_version=__version__)
-        self.app_blocker = AppBlocker(self.config, self.logger)
+        # Nomes de processo compartilhados entre AppBlocker e WindowTracker
+        self.process_cache = ProcessCache()
+        self.app_blocker = AppBlocker(self.config, self.logger, process_cache=self.process_cache)
         self.site_blocker = SiteBlocker(self.config, self.logger)
-        self.window_tracker = WindowTracker(poll_interval=5)
+        self.window_tracker = WindowTracker(poll_interval=5, process_cache=self.process_cache)
         self.browser_history = BrowserHistory()
+        self.outbox = Outbox()
         
         self.audio_signals = AudioSignals()
-        self.audio_signals.audio_update.connect(self._on_audio_update_safe)
+        self.audio_signals.strike_action.connect(self._on_strike_action)
         self.audio_signals.command_executed.connect(self._on_command_executed)
         self.audio_signals.unpair_triggered.connect(self._on_unpair)
         
-        self.audio_monitor = AudioMonitor(callback=self._on_audio_update_thread)
+        audio_log = None
+        if self.config.get("audio_log_enabled", True):
+            try:
+                audio_log = AudioFeatureLog(dias=self.config.get("audio_log_dias", 7))
+            except (OSError, ValueError) as e:
+                print(f"Log de features de áudio indisponível: {e}")
+        self.audio_monitor = AudioMonitor(
+            callback=self._on_audio_update_thread,
+            # O log guarda o dB na banda de voz, que vem do estágio espectral
+            espectral=self.config.get("strike_metrica", "rms") != "rms" or audio_log is not None,
+            vad=self.config.get("vad_enabled", False),
+            audio_log=audio_log,
+            limite_fala_db=lambda: self.config.get("volume_grito_db", 85),
+        )
+        # Último nível publicado pela thread de áudio: (seq, nivel, media, pico).
+        # A UI lê no próprio ritmo (AUDIO_UI_FPS); chunks intermediários se fundem.
+        self._ultimo_audio: Optional[tuple] = None
+        self._audio_seq_exibido = 0
         
         self.noise_meter = None
         self.tray = None
@@ -97,6 +126,7 @@ class KidsPC:
         """Chamado quando o programa encerra normalmente."""
         try:
             self.window_tracker.stop()
+            self.app_blocker.stop()
             self.activity_tracker.stop()
             self.site_blocker.cleanup()
             self.logger.app_encerrado()
@@ -113,9 +143,19 @@ class KidsPC:
             self.logger.sessao_iniciada()
         elif event_type == "ended":
             pass
+        self._atualizar_modo_audio()
+    
+    def _atualizar_modo_audio(self):
+        """Captura em modo economia enquanto o PC está ocioso ou bloqueado."""
+        if not self.config.get("audio_economia_enabled", True):
+            return
+        self.audio_monitor.set_economia(
+            not self.activity_tracker.is_active() or self.screen_locker.is_enforcing()
+        )
     
     def _check_time(self):
         """Verifica limites de tempo periodicamente."""
+        self._atualizar_modo_audio()
         try:
             remaining = self.time_manager.get_remaining_minutes()
             if self.noise_meter:
@@ -154,19 +194,54 @@ class KidsPC:
         except Exception as e:
             print(f"Erro no check de tempo: {e}")
     
-    def _on_audio_update_thread(self, nivel_db: float, media_db: float, pico_db: float):
-        """Chamado da thread do AudioMonitor - emite sinal para thread principal."""
-        self.audio_signals.audio_update.emit(nivel_db, media_db, pico_db)
+    def _on_audio_update_thread(self, nivel_db: float, media_db: float, pico_db: float, fala: bool):
+        """Chamado da thread do AudioMonitor.
+        
+        Publica o nível para a UI (sem sinal Qt por chunk) e avalia strikes
+        aqui mesmo (com o VAD ligado, só em chunks com fala). Apenas ações de strike vão
+        para a thread principal.
+        """
+        seq = self._ultimo_audio[0] + 1 if self._ultimo_audio else 1
+        self._ultimo_audio = (seq, nivel_db, media_db, pico_db)
+        
+        if not self.noise_meter or not fala:
+            return
+        try:
+            inicio = time.perf_counter()
+            acao = self.strike_manager.processar_barulho(
+                nivel_db,
+                nivel_voz_db=self.audio_monitor.get_nivel_voz(),
+                nivel_a_db=self.audio_monitor.get_nivel_a(),
+                audio_offset=self.audio_monitor.get_audio_log_offset(),
+            )
+            self.audio_monitor.registrar_custo_downstream(time.perf_counter() - inicio)
+            if acao != StrikeAction.NONE:
+                self.audio_signals.strike_action.emit(acao, nivel_db)
+        except Exception as e:
+            print(f"Erro no processamento de áudio: {e}")
+    
+    def _setup_audio_ui_timer(self):
+        """Timer que leva o último nível de áudio ao medidor (taxa limitada)."""
+        self.audio_ui_timer = QTimer()
+        self.audio_ui_timer.timeout.connect(self._atualizar_audio_ui)
+        self.audio_ui_timer.start(1000 // AUDIO_UI_FPS)
     
-    def _on_audio_update_safe(self, nivel_db: float, media_db: float, pico_db: float):
-        """Chamado na thread principal via sinal Qt - seguro para UI."""
-        if not self.noise_meter:
+    def _atualizar_audio_ui(self):
+        """Thread principal: mostra só o nível mais recente, se mudou."""
+        ultimo = self._ultimo_audio
+        if not self.noise_meter or not ultimo or ultimo[0] == self._audio_seq_exibido:
             return
+        self._audio_seq_exibido = ultimo[0]
+        try:
+            self.noise_meter.atualizar_nivel(ultimo[1])
+            self.noise_meter.atualizar_strikes(self.strike_manager.get_strikes())
+        except Exception as e:
+            print(f"Erro ao atualizar medidor: {e}")
+    
+    def _on_strike_action(self, acao: StrikeAction, nivel_db: float):
+        """Slot Qt (main thread) — popups e penalidade de um strike."""
         try:
-            self.noise_meter.atualizar_nivel(nivel_db)
             self.noise_meter.atualizar_strikes(self.strike_manager.get_strikes())
-            
-            acao = self.strike_manager.processar_barulho(nivel_db)
             
             if acao == StrikeAction.POPUP_AVISO:
                 try:
@@ -192,11 +267,11 @@ class KidsPC:
                 self._check_time()
                 
         except Exception as e:
-            print(f"Erro no processamento de áudio: {e}")
+            print(f"Erro no processamento de strike: {e}")
     
     def _primeiro_uso(self):
         from src.ui.welcome_tutorial import WelcomeTutorial
-        tutorial = WelcomeTutorial(self.config, self.logger)
+        tutorial = WelcomeTutorial(self.config, self.logger, audio_monitor=self.audio_monitor)
         tutorial.exec_()
         
         self.config.primeiro_uso = False
@@ -210,12 +285,6 @@ class KidsPC:
             if not dialog.is_paired():
                 sys.exit(0)
     
-    def _setup_app_blocker_timer(self):
-        """Timer que verifica apps bloqueados a cada 3s."""
-        self.app_blocker_timer = QTimer()
-        self.app_blocker_timer.timeout.connect(self.app_blocker.check)
-        self.app_blocker_timer.start(3000)
-
     def _start_remote_sync(self):
         """Inicia sync remoto se pareado."""
         if self.config.get("paired", False):
@@ -234,6 +303,7 @@ class KidsPC:
                 audio_monitor=self.audio_monitor,
                 window_tracker=self.window_tracker,
                 browser_history=self.browser_history,
+                outbox=self.outbox,
             )
             self.remote_sync.start()
     
@@ -270,8 +340,9 @@ class KidsPC:
         self.screen_locker.stop_enforcement()
         if hasattr(self, 'time_check_timer'):
             self.time_check_timer.stop()
-        if hasattr(self, 'app_blocker_timer'):
-            self.app_blocker_timer.stop()
+        if hasattr(self, 'audio_ui_timer'):
+            self.audio_ui_timer.stop()
+        self.app_blocker.stop()
         
         # Hide UI
         if self.noise_meter:
@@ -300,7 +371,7 @@ class KidsPC:
         self.activity_tracker.start()
         self.window_tracker.start()
         self._start_remote_sync()
-        self._setup_app_blocker_timer()
+        self.app_blocker.start()
 
     def _init_ui(self):
         """Cria widgets de UI após o pairing estar completo."""
@@ -316,6 +387,7 @@ class KidsPC:
         )
         
         self._setup_time_check_timer()
+        self._setup_audio_ui_timer()
     
     def _check_startup_update(self):
         """Verifica atualização no início — garante que bugs críticos sejam corrigidos."""
@@ -342,7 +414,7 @@ class KidsPC:
         self.activity_tracker.start()
         self.window_tracker.start()
         self._start_remote_sync()
-        self._setup_app_blocker_timer()
+        self.app_blocker.start()
         
         remaining = self.time_manager.get_remaining_minutes()
         self.noise_meter.atualizar_tempo(remaining)
@@ -0,0 +1,116 @@
+"""Fila de saída (outbox) persistente para o RemoteSync.
+
+Todo registro que vai para o Supabase (sessões, eventos, agregados de uso)
+é gravado primeiro num SQLite em modo WAL em %APPDATA%/KidsPC/outbox.db.
+O RemoteSync drena a fila em lotes ordenados e só remove as linhas depois
+que o servidor confirma o lote — nada se perde se o app reiniciar offline.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class Outbox:
+    """Fila append-only em SQLite, particionada por tipo (tabela de destino).
+
+    Cada linha tem uma chave (kind, key). Para registros imutáveis
+    (sessões, eventos) uma chave repetida é ignorada; para agregados
+    (app_usage, site_visits, daily_usage) o valor novo substitui o antigo,
+    então só o último valor de cada linha é enviado.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        if path is None:
+            app_data_dir = Path(os.environ.get("APPDATA", ".")) / "KidsPC"
+            app_data_dir.mkdir(parents=True, exist_ok=True)
+            path = app_data_dir / "outbox.db"
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=5, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                UNIQUE(kind, key)
+            )
+        """)
+        self._conn.commit()
+
+        self._drained_total = 0
+        self._drain_seconds = 0.0
+
+    def enqueue(self, kind: str, items: List[Tuple[str, Dict[str, Any]]], replace: bool = False):
+        """Grava [(key, payload), ...] na fila numa única transação.
+
+        replace=True substitui o payload pendente com a mesma chave (a linha
+        vai para o fim da fila, com novo id).
+        """
+        if not items:
+            return
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    f"{verb} INTO outbox (kind, key, payload, created_at) VALUES (?, ?, ?, ?)",
+                    [(kind, key, json.dumps(payload, ensure_ascii=False), now) for key, payload in items],
+                )
+
+    def peek(self, kind: str, limit: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """Retorna até `limit` linhas pendentes de `kind`, em ordem de chegada."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT id, payload FROM outbox WHERE kind = ? ORDER BY id LIMIT ?",
+                (kind, limit),
+            )
+            return [(row_id, json.loads(payload)) for row_id, payload in cursor.fetchall()]
+
+    def ack(self, ids: List[int], elapsed_seconds: float = 0.0):
+        """Remove linhas confirmadas pelo servidor."""
+        if not ids:
+            return
+        with self._lock:
+            with self._conn:
+                self._conn.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+            self._drained_total += len(ids)
+            self._drain_seconds += elapsed_seconds
+
+    def depth(self, kind: Optional[str] = None) -> int:
+        """Quantidade de linhas pendentes (de um tipo ou no total)."""
+        with self._lock:
+            if kind is None:
+                row = self._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()
+            else:
+                row = self._conn.execute("SELECT COUNT(*) FROM outbox WHERE kind = ?", (kind,)).fetchone()
+            return row[0]
+
+    def clear(self):
+        """Descarta toda a fila (ex: PC desvinculado)."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM outbox")
+
+    def get_stats(self) -> Dict[str, float]:
+        """Profundidade da fila e vazão de drenagem (linhas/s)."""
+        depth = self.depth()
+        with self._lock:
+            rate = self._drained_total / self._drain_seconds if self._drain_seconds > 0 else 0.0
+            return {
+                "outbox_depth": depth,
+                "outbox_drained": self._drained_total,
+                "outbox_drain_rows_per_sec": round(rate, 1),
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
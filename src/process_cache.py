@@ -0,0 +1,194 @@
+"""Cache de informações de processo (PID → nome) compartilhado.
+
+WindowTracker (janela em foco) e AppBlocker (varredura de processos)
+resolvem os mesmos nomes o tempo todo. Aqui cada processo é consultado uma
+vez: a chave é (pid, create_time). Todo PID já conhecido tem o create_time
+relido (uma chamada barata) antes de reaproveitar a entrada, então um PID
+reaproveitado por outro processo não herda o nome antigo. Entradas saem
+quando o PID some de psutil.pids().
+
+Caminho do executável e editor (CompanyName) são lidos só sob demanda, para
+regras de bloqueio por pasta/editor, e também ficam em cache.
+"""
+
+import ctypes
+import struct
+import sys
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import psutil
+
+_version = ctypes.windll.version if sys.platform == "win32" else None
+
+
+def _ler_publisher(caminho: str) -> Optional[str]:
+    """CompanyName do recurso de versão do executável (Windows), ou None."""
+    if _version is None:
+        return None
+    tamanho = _version.GetFileVersionInfoSizeW(caminho, None)
+    if not tamanho:
+        return None
+    buf = ctypes.create_string_buffer(tamanho)
+    if not _version.GetFileVersionInfoW(caminho, 0, tamanho, buf):
+        return None
+    ptr = ctypes.c_void_p()
+    n = ctypes.c_uint()
+    if not _version.VerQueryValueW(buf, "\\VarFileInfo\\Translation", ctypes.byref(ptr), ctypes.byref(n)) \
+            or n.value < 4:
+        return None
+    idioma, codepage = struct.unpack("<HH", ctypes.string_at(ptr.value, 4))
+    chave = f"\\StringFileInfo\\{idioma:04x}{codepage:04x}\\CompanyName"
+    if not _version.VerQueryValueW(buf, chave, ctypes.byref(ptr), ctypes.byref(n)) or not n.value:
+        return None
+    return ctypes.wstring_at(ptr.value, n.value).rstrip("\0") or None
+
+
+class ProcessInfo(NamedTuple):
+    pid: int
+    create_time: float
+    name: Optional[str]  # lowercase; None se o nome não pôde ser lido
+
+
+class ProcessCache:
+    """PID → ProcessInfo com contagem de acertos (get_stats)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._por_pid: Dict[int, ProcessInfo] = {}
+        self._exes: Dict[Tuple[int, float], Optional[str]] = {}  # (pid, create_time) → caminho
+        self._publishers: Dict[str, Optional[str]] = {}          # caminho → editor
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def _create_time(pid: int) -> Optional[float]:
+        """create_time atual do PID, ou None se ele não existe/não é acessível."""
+        try:
+            return psutil.Process(pid).create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+    def _carregar(self, pid: int) -> Optional[ProcessInfo]:
+        """Lê create_time e nome do processo (syscalls). None se ele já saiu."""
+        try:
+            proc = psutil.Process(pid)
+            create_time = proc.create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+        try:
+            name = proc.name().lower()
+        except psutil.AccessDenied:
+            name = None  # guardado mesmo assim: não tenta de novo a cada varredura
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            return None
+        return ProcessInfo(pid, create_time, name)
+
+    def get(self, pid: int) -> Optional[ProcessInfo]:
+        """Info de um PID (ex: dono da janela em foco), ou None se não existe.
+
+        O create_time é sempre conferido antes de reaproveitar o nome.
+        """
+        with self._lock:
+            info = self._por_pid.get(pid)
+        if info and self._create_time(pid) == info.create_time:
+            with self._lock:
+                self._stats["hits"] += 1
+            return info
+        novo = self._carregar(pid)
+        with self._lock:
+            self._stats["misses"] += 1
+            if info:
+                self._stats["evictions"] += 1  # processo saiu ou PID reaproveitado
+            if novo:
+                self._por_pid[pid] = novo
+            else:
+                self._por_pid.pop(pid, None)
+        return novo
+
+    def name(self, pid: int) -> Optional[str]:
+        info = self.get(pid)
+        return info.name if info else None
+
+    def snapshot(self) -> Dict[int, ProcessInfo]:
+        """Todos os processos vivos. PIDs conhecidos custam só o create_time;
+        nome é lido para PIDs novos ou reaproveitados.
+
+        Quem for agir sobre um processo (ex: encerrar) ainda deve conferir
+        create_time com matches(): ele pode ter saído desde a varredura.
+        """
+        pids = psutil.pids()
+        with self._lock:
+            conhecidos = self._por_pid
+        atual: Dict[int, ProcessInfo] = {}
+        hits = misses = 0
+        for pid in pids:
+            info = conhecidos.get(pid)
+            if info and self._create_time(pid) == info.create_time:
+                hits += 1
+            else:
+                misses += 1
+                info = self._carregar(pid)
+                if info is None:
+                    continue
+            atual[pid] = info
+        with self._lock:
+            self._stats["evictions"] += sum(
+                1 for pid, info in self._por_pid.items()
+                if pid not in atual or atual[pid].create_time != info.create_time
+            )
+            self._stats["hits"] += hits
+            self._stats["misses"] += misses
+            self._por_pid = atual
+            if self._exes:
+                self._exes = {k: v for k, v in self._exes.items()
+                              if k[0] in atual and atual[k[0]].create_time == k[1]}
+        return dict(atual)
+
+    def exe(self, info: ProcessInfo) -> Optional[str]:
+        """Caminho completo do executável (lido uma vez por processo)."""
+        chave = (info.pid, info.create_time)
+        with self._lock:
+            if chave in self._exes:
+                return self._exes[chave]
+        try:
+            caminho = psutil.Process(info.pid).exe() or None
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            caminho = None
+        with self._lock:
+            self._exes[chave] = caminho
+        return caminho
+
+    def publisher(self, info: ProcessInfo) -> Optional[str]:
+        """Editor do executável (CompanyName), em cache por caminho."""
+        caminho = self.exe(info)
+        if not caminho:
+            return None
+        with self._lock:
+            if caminho in self._publishers:
+                return self._publishers[caminho]
+        try:
+            editor = _ler_publisher(caminho)
+        except Exception:
+            editor = None
+        with self._lock:
+            if len(self._publishers) > 5000:
+                self._publishers.clear()
+            self._publishers[caminho] = editor
+        return editor
+
+    @staticmethod
+    def matches(info: ProcessInfo, proc: psutil.Process) -> bool:
+        """True se `proc` ainda é o processo descrito por `info` (PID não reaproveitado)."""
+        try:
+            return proc.create_time() == info.create_time
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return False
+
+    def get_stats(self) -> dict:
+        """Acertos, consultas ao sistema e taxa de acerto."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._por_pid)
+        total = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / total, 3) if total else None
+        return stats
@@ -2,22 +2,40 @@
 
 Adiciona entradas no hosts file redirecionando domínios bloqueados para 127.0.0.1.
 Marcadores delimitam a seção do KidsPC para fácil limpeza.
+
+A troca da seção é feita em streaming (linha a linha, sem carregar o hosts
+inteiro) para um arquivo temporário na mesma pasta, que substitui o hosts
+com os.replace — um crash no meio nunca deixa o hosts pela metade. Antes,
+uma passada só de leitura compara os hashes do conteúdo atual e do novo:
+se forem iguais, nenhum arquivo é criado.
 """
 
+import hashlib
 import os
-from typing import List, Dict, Any
+import tempfile
+import time
+from typing import Iterator, List, Dict, Any, Optional
 
 HOSTS_PATH = r"C:\Windows\System32\drivers\etc\hosts"
 MARKER_START = "# === KidsPC Blocked Sites START ==="
 MARKER_END = "# === KidsPC Blocked Sites END ==="
 
+# Leitura do hosts em blocos de linhas (~1 MB): memória constante mesmo
+# com listas de ad-block de 100k+ linhas
+HOSTS_BLOCO_BYTES = 1 << 20
+
+# os.replace falha se antivírus/DNS client estiver com o hosts aberto
+REPLACE_TENTATIVAS = 5
+REPLACE_ESPERA_SECONDS = 0.2
+
 
 class SiteBlocker:
     """Gerencia bloqueio de sites via hosts file."""
     
-    def __init__(self, config, logger):
+    def __init__(self, config, logger, hosts_path: str = HOSTS_PATH):
         self.config = config
         self.logger = logger
+        self.hosts_path = hosts_path
         self._domains: List[str] = []
         self._enabled: bool = False
     
@@ -43,74 +61,118 @@ class SiteBlocker:
     def _apply(self):
         """Reescreve a seção KidsPC no hosts file."""
         try:
-            # Ler conteúdo atual do hosts
-            current = ""
-            if os.path.exists(HOSTS_PATH):
-                with open(HOSTS_PATH, "r", encoding="utf-8") as f:
-                    current = f.read()
-            
-            # Remover seção KidsPC existente
-            cleaned = self._strip_kidspc_section(current)
-            
-            # Se não há domínios, apenas limpar
-            if not self._domains:
-                if MARKER_START in current:
-                    # Havia seção antes, remover
-                    self._write_hosts(cleaned)
-                return
+            # Sem domínios: apenas remove a seção (se houver)
+            section = None
+            if self._domains:
+                section = [MARKER_START]
+                for domain in self._domains:
+                    section.append(f"127.0.0.1 {domain}")
+                    # Também bloquear variante www
+                    if not domain.startswith("www."):
+                        section.append(f"127.0.0.1 www.{domain}")
+                section.append(MARKER_END)
             
-            # Gerar novas entradas
-            lines = [MARKER_START]
-            for domain in self._domains:
-                lines.append(f"127.0.0.1 {domain}")
-                # Também bloquear variante www
-                if not domain.startswith("www."):
-                    lines.append(f"127.0.0.1 www.{domain}")
-            lines.append(MARKER_END)
-            
-            new_section = "\n".join(lines)
-            
-            # Garantir newline antes da seção
-            if cleaned and not cleaned.endswith("\n"):
-                cleaned += "\n"
-            
-            final = cleaned + "\n" + new_section + "\n"
-            
-            self._write_hosts(final)
-            
-            print(f"SiteBlocker: hosts file atualizado ({len(self._domains)} domínios)")
+            if self._splice(section) and section:
+                print(f"SiteBlocker: hosts file atualizado ({len(self._domains)} domínios)")
             
         except PermissionError:
             print("SiteBlocker: sem permissão para editar hosts file (precisa de admin)")
         except Exception as e:
             print(f"SiteBlocker: erro ao atualizar hosts: {e}")
     
-    def _strip_kidspc_section(self, content: str) -> str:
-        """Remove a seção KidsPC do conteúdo do hosts file."""
-        lines = content.split("\n")
-        result = []
-        inside_section = False
+    def _blocos(self, section: Optional[List[str]], lido: Dict[str, Any]) -> Iterator[str]:
+        """Gera o hosts novo em blocos: o atual com a seção KidsPC trocada por
+        `section` (None = só remove).
         
-        for line in lines:
-            if line.strip() == MARKER_START:
-                inside_section = True
-                continue
-            if line.strip() == MARKER_END:
+        Fora da seção as linhas são mantidas, exceto as em branco no final.
+        O arquivo é lido em blocos de ~1 MB; blocos sem marcador (quase todos)
+        passam inteiros, sem laço por linha. Ao terminar a leitura, `lido`
+        recebe o sha256 do arquivo atual e se ele tinha a seção.
+        """
+        hash_atual = hashlib.sha256()
+        tinha_secao = False
+        if os.path.exists(self.hosts_path):
+            with open(self.hosts_path, "r", encoding="utf-8") as f:
                 inside_section = False
-                continue
-            if not inside_section:
-                result.append(line)
+                brancos: List[str] = []  # só saem se vier conteúdo depois
+                while True:
+                    lines = f.readlines(HOSTS_BLOCO_BYTES)
+                    if not lines:
+                        break
+                    bloco = "".join(lines)
+                    hash_atual.update(bloco.encode("utf-8"))
+                    if not lines[-1].endswith("\n"):
+                        lines[-1] += "\n"
+                    
+                    if not inside_section and MARKER_START not in bloco and MARKER_END not in bloco:
+                        mantidas = lines
+                    else:
+                        mantidas = []
+                        for line in lines:
+                            marcador = line.strip()
+                            if marcador == MARKER_START:
+                                inside_section = tinha_secao = True
+                            elif marcador == MARKER_END:
+                                inside_section = False
+                            elif not inside_section:
+                                mantidas.append(line)
+                    
+                    k = len(mantidas)
+                    while k and not mantidas[k - 1].strip():
+                        k -= 1
+                    if k:
+                        yield "".join(brancos) + "".join(mantidas[:k])
+                        brancos = mantidas[k:]
+                    else:
+                        brancos.extend(mantidas)
+        lido["sha256"] = hash_atual.digest()
+        lido["tinha_secao"] = tinha_secao
         
-        # Remover linhas em branco extras no final
-        while result and result[-1].strip() == "":
-            result.pop()
+        if section:
+            # Linha em branco separando a seção do conteúdo do usuário
+            yield "\n" + "\n".join(section) + "\n"
+    
+    def _splice(self, section: Optional[List[str]]) -> bool:
+        """Troca a seção KidsPC por `section` (None = só remove) se o conteúdo mudou.
+        
+        Uma primeira passada só de leitura compara o hash do hosts atual com
+        o do conteúdo novo; o temporário só é criado (e o hosts substituído)
+        quando eles diferem.
+        Retorna True se o hosts foi reescrito.
+        """
+        lido: Dict[str, Any] = {}
+        hash_novo = hashlib.sha256()
+        for texto in self._blocos(section, lido):
+            hash_novo.update(texto.encode("utf-8"))
+        if section is None and not lido["tinha_secao"]:
+            return False  # nada nosso para remover: não mexe no arquivo do usuário
+        if hash_novo.digest() == lido["sha256"]:
+            return False
         
-        return "\n".join(result)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.hosts_path) or ".", prefix="hosts.kidspc.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as out:
+                for texto in self._blocos(section, {}):
+                    out.write(texto)
+                out.flush()
+                os.fsync(out.fileno())
+            
+            self._replace(tmp_path)
+            tmp_path = None
+            return True
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
     
-    def _write_hosts(self, content: str):
-        """Escreve conteúdo no hosts file."""
-        with open(HOSTS_PATH, "w", encoding="utf-8") as f:
-            f.write(content)
+    def _replace(self, tmp_path: str):
+        for tentativa in range(REPLACE_TENTATIVAS):
+            try:
+                os.replace(tmp_path, self.hosts_path)
+                return
+            except PermissionError:
+                if tentativa == REPLACE_TENTATIVAS - 1:
+                    raise
+                time.sleep(REPLACE_ESPERA_SECONDS)
     
     def cleanup(self):
         """Remove entradas do KidsPC do hosts file.
@@ -118,19 +180,8 @@ class SiteBlocker:
         Chamado no shutdown gracioso do app.
         """
         try:
-            if not os.path.exists(HOSTS_PATH):
-                return
-            
-            with open(HOSTS_PATH, "r", encoding="utf-8") as f:
-                current = f.read()
-            
-            if MARKER_START not in current:
-                return
-            
-            cleaned = self._strip_kidspc_section(current)
-            self._write_hosts(cleaned)
-            
-            print("SiteBlocker: hosts file limpo")
+            if self._splice(None):
+                print("SiteBlocker: hosts file limpo")
             
         except Exception as e:
             print(f"SiteBlocker: erro ao limpar hosts: {e}")
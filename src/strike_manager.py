@@ -29,26 +29,43 @@ class StrikeManager:
     def get_penalty_minutes(self) -> int:
         return self.config.get("strike_penalty_minutes", 30)
     
-    def processar_barulho(self, nivel_db: float) -> StrikeAction:
-        """Processa nível de áudio atual. Retorna ação se strike ocorreu."""
+    def processar_barulho(self, nivel_db: float, agora: Optional[datetime] = None,
+                          nivel_voz_db: Optional[float] = None,
+                          nivel_a_db: Optional[float] = None,
+                          audio_offset: Optional[int] = None) -> StrikeAction:
+        """Processa nível de áudio atual. Retorna ação se strike ocorreu.
+        
+        `agora` permite replay acelerado (benchmark); padrão é o relógio.
+        Com strike_metrica "voz" ou "a" e o nível espectral correspondente
+        informado, o limite é comparado com ele em vez do RMS de banda larga.
+        `audio_offset` (registro no log de features) vai junto no evento de strike.
+        """
         if not self.config.get("strikes_enabled", False):
             return StrikeAction.NONE
         
+        metrica = self.config.get("strike_metrica", "rms")
+        if metrica == "voz" and nivel_voz_db is not None:
+            nivel_db = nivel_voz_db
+        elif metrica == "a" and nivel_a_db is not None:
+            nivel_db = nivel_a_db
+        
         limite_grito = self.config.get("volume_grito_db", 85)
         
         if nivel_db < limite_grito:
             return StrikeAction.NONE
         
+        agora = agora or datetime.now()
+        
         # Mini-cooldown para evitar múltiplos strikes no mesmo grito
         if self._ultimo_strike_time:
-            elapsed = (datetime.now() - self._ultimo_strike_time).total_seconds()
+            elapsed = (agora - self._ultimo_strike_time).total_seconds()
             if elapsed < self.COOLDOWN_SECONDS:
                 return StrikeAction.NONE
         
         self._strikes += 1
-        self._ultimo_strike_time = datetime.now()
+        self._ultimo_strike_time = agora
         
-        self.logger.strike(self._strikes, nivel_db)
+        self.logger.strike(self._strikes, nivel_db, audio_offset=audio_offset)
         
         posicao_ciclo = self._strikes % 3  # 1, 2, 0 (0 = penalidade)
         if posicao_ciclo == 1:
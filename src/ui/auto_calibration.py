@@ -26,45 +26,22 @@ class AutoCalibrationThread(QThread):
         self._running = False
 
     def run(self):
-        import pyaudio
-        import numpy as np
-
         amostras = []
         picos = []
         duracao_segundos = self.duracao_segundos
 
-        CHUNK = 1024
-        FORMAT = pyaudio.paInt16
-        CHANNELS = 1
-        RATE = 44100
-
+        # Lê do barramento do AudioMonitor — sem abrir um segundo stream no microfone
+        sub = self.audio_monitor.subscribe(maxsize=50)
         try:
-            pa = pyaudio.PyAudio()
-            stream = pa.open(
-                format=FORMAT,
-                channels=CHANNELS,
-                rate=RATE,
-                input=True,
-                frames_per_buffer=CHUNK
-            )
-
             inicio = time.time()
             ultimo_pico_time = 0
             janela_pico = []
 
             while self._running and (time.time() - inicio) < duracao_segundos:
-                data = stream.read(CHUNK, exception_on_overflow=False)
-                audio_data = np.frombuffer(data, dtype=np.int16).astype(np.float64)
-
-                if len(audio_data) > 0:
-                    rms = np.sqrt(np.mean(audio_data ** 2))
-                    if rms > 0:
-                        db = 20 * np.log10(rms / 32768.0) + 96
-                        db = max(0, min(120, db))
-                    else:
-                        db = 0
-                else:
-                    db = 0
+                item = sub.get(timeout=1.0)
+                if item is None:
+                    continue
+                db = item[1]
 
                 amostras.append(db)
                 janela_pico.append(db)
@@ -84,12 +61,6 @@ class AutoCalibrationThread(QThread):
                 stats = self._calcular_stats(amostras, picos)
                 self.progress.emit(progresso, db, stats)
 
-                time.sleep(0.1)
-
-            stream.stop_stream()
-            stream.close()
-            pa.terminate()
-
             resultado = self._calcular_resultado_final(amostras, picos)
             self.finished_calibration.emit(resultado)
 
@@ -101,6 +72,8 @@ class AutoCalibrationThread(QThread):
                 "limite_atencao": 75,
                 "limite_pico": 90
             })
+        finally:
+            sub.close()
 
     def _calcular_stats(self, amostras, picos):
         if not amostras:
@@ -155,11 +128,15 @@ class AutoCalibrationDialog(QDialog):
 
     DURACAO = 60  # 1 minuto
 
-    def __init__(self, config, logger, parent=None, auto_start=False):
+    def __init__(self, config, logger, parent=None, auto_start=False, audio_monitor=None):
         super().__init__(parent)
         self.config = config
         self.logger = logger
         self._auto_start = auto_start
+        if audio_monitor is None:
+            from ..audio_monitor import AudioMonitor
+            audio_monitor = AudioMonitor()
+        self.audio_monitor = audio_monitor
         self.setWindowTitle("🎯 Calibração Automática")
         self.setFixedSize(540, 500)
         self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)
@@ -167,6 +144,7 @@ class AutoCalibrationDialog(QDialog):
         self._thread = None
         self._resultado = None
         self._poll_timer = None
+        self._live_sub = None
         self._setup_ui()
 
         if auto_start:
@@ -258,10 +236,7 @@ class AutoCalibrationDialog(QDialog):
             "background-color: #6b7280; color: white; border-radius: 6px; padding: 0 20px;"
         )
 
-        from ..audio_monitor import AudioMonitor
-        monitor = AudioMonitor()
-
-        self._thread = AutoCalibrationThread(monitor, duracao_segundos=self.DURACAO)
+        self._thread = AutoCalibrationThread(self.audio_monitor, duracao_segundos=self.DURACAO)
         self._thread.progress.connect(self._on_progress)
         self._thread.finished_calibration.connect(self._on_finished)
         self._thread.start()
@@ -310,17 +285,15 @@ class AutoCalibrationDialog(QDialog):
 
     def _start_live_polling(self):
         """Continua mostrando áudio ao vivo após calibração para ajuste visual."""
-        from ..audio_monitor import AudioMonitor
-        self._live_monitor = AudioMonitor()
-        self._live_monitor.start()
+        self._live_sub = self.audio_monitor.subscribe(maxsize=20)
         self._poll_timer = QTimer(self)
         self._poll_timer.timeout.connect(self._poll_live)
         self._poll_timer.start(100)
 
     def _poll_live(self):
-        if hasattr(self, '_live_monitor'):
-            db = self._live_monitor.get_nivel_atual()
-            self.audio_widget.push_sample(db)
+        if self._live_sub:
+            for _, db in self._live_sub.drain():
+                self.audio_widget.push_sample(db)
 
     def _aplicar_resultado(self):
         if not self._resultado:
@@ -337,6 +310,7 @@ class AutoCalibrationDialog(QDialog):
         self.config.set("offset_pico_db", int(strike - ruido))
 
         self.logger.calibracao(ruido)
+        self._stop_live()
         self.accept()
 
     def _cancelar(self):
@@ -349,8 +323,9 @@ class AutoCalibrationDialog(QDialog):
     def _stop_live(self):
         if self._poll_timer:
             self._poll_timer.stop()
-        if hasattr(self, '_live_monitor'):
-            self._live_monitor.stop()
+        if self._live_sub:
+            self._live_sub.close()
+            self._live_sub = None
 
     def closeEvent(self, event):
         self._cancelar()
@@ -3,28 +3,53 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from PyQt5.QtGui import QFont
+import statistics
+import time
 
 class CalibrationThread(QThread):
     progress = pyqtSignal(float, float)  # progresso, nivel_db
     finished_calibration = pyqtSignal(float)  # ruido_ambiente
     
+    DURACAO = 30
+    
     def __init__(self, audio_monitor):
         super().__init__()
         self.audio_monitor = audio_monitor
+        self._running = True
+    
+    def stop(self):
+        self._running = False
     
     def run(self):
-        def callback(progresso, db):
-            self.progress.emit(progresso, db)
+        # Amostras vêm do barramento do AudioMonitor (mesmo stream do app)
+        amostras = []
+        sub = self.audio_monitor.subscribe(maxsize=50)
+        try:
+            inicio = time.time()
+            while self._running and (time.time() - inicio) < self.DURACAO:
+                item = sub.get(timeout=1.0)
+                if item is None:
+                    continue
+                amostras.append(item[1])
+                self.progress.emit((time.time() - inicio) / self.DURACAO, item[1])
+        finally:
+            sub.close()
         
-        ruido = self.audio_monitor.calibrar(30, callback)
+        if not self._running:
+            return
+        ruido = statistics.median(amostras) if amostras else 40.0
         self.finished_calibration.emit(ruido)
 
 
 class CalibrationDialog(QDialog):
-    def __init__(self, config, logger, parent=None):
+    def __init__(self, config, logger, parent=None, audio_monitor=None):
         super().__init__(parent)
         self.config = config
         self.logger = logger
+        if audio_monitor is None:
+            from ..audio_monitor import AudioMonitor
+            audio_monitor = AudioMonitor()
+        self.audio_monitor = audio_monitor
         self.setWindowTitle("🎤 Calibração")
         self.setFixedSize(400, 250)
         self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)
@@ -73,10 +98,7 @@ class CalibrationDialog(QDialog):
         self.btn_iniciar.setEnabled(False)
         self.btn_iniciar.setText("Calibrando...")
         
-        from ..audio_monitor import AudioMonitor
-        monitor = AudioMonitor()
-        
-        self._thread = CalibrationThread(monitor)
+        self._thread = CalibrationThread(self.audio_monitor)
         self._thread.progress.connect(self._on_progress)
         self._thread.finished_calibration.connect(self._on_finished)
         self._thread.start()
@@ -110,6 +132,6 @@ class CalibrationDialog(QDialog):
     
     def closeEvent(self, event):
         if self._thread and self._thread.isRunning():
-            self._thread.terminate()
-            self._thread.wait()
+            self._thread.stop()
+            self._thread.wait(2000)
         super().closeEvent(event)
@@ -70,19 +70,25 @@ class LiveThresholdWidget(QWidget):
         layout.addWidget(self.label_nivel)
     
     def _start_monitoring(self):
+        # Amostras pelo barramento do AudioMonitor: cada chunk entra uma vez no histórico
+        self._sub = self.audio_monitor.subscribe(maxsize=20) if self.audio_monitor else None
         self.timer = QTimer(self)
         self.timer.timeout.connect(self._atualizar_visualizacao)
         self.timer.start(50)  # 20 FPS
     
     def _atualizar_visualizacao(self):
-        if self.audio_monitor:
-            self._nivel_atual = self.audio_monitor.get_nivel_atual()
-            self._media_atual = self.audio_monitor.get_media()
-            self._pico_atual = self.audio_monitor.get_pico()
-        
-        self._historico.append(self._nivel_atual)
+        if not self._sub:
+            return
+        amostras = self._sub.drain()
+        if not amostras:
+            return
+        for _, db in amostras:
+            self._historico.append(db)
         if len(self._historico) > 100:
-            self._historico.pop(0)
+            del self._historico[:-100]
+        self._nivel_atual = amostras[-1][1]
+        self._media_atual = self.audio_monitor.get_media()
+        self._pico_atual = self.audio_monitor.get_pico()
         
         if self._nivel_atual < self._limite_media:
             cor = "#4CAF50"
@@ -121,6 +127,9 @@ class LiveThresholdWidget(QWidget):
     def stop(self):
         if hasattr(self, 'timer'):
             self.timer.stop()
+        if self._sub:
+            self._sub.close()
+            self._sub = None
 
 
 class AudioVisualizer(QWidget):
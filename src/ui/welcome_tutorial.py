@@ -15,10 +15,11 @@ class WelcomeTutorial(QDialog):
     4. Pronto — confirma e ativa strikes
     """
     
-    def __init__(self, config, logger, parent=None):
+    def __init__(self, config, logger, parent=None, audio_monitor=None):
         super().__init__(parent)
         self.config = config
         self.logger = logger
+        self.audio_monitor = audio_monitor
         self.setWindowTitle("Tutorial KidsPC")
         self.setFixedSize(520, 480)
         self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)
@@ -178,7 +179,9 @@ class WelcomeTutorial(QDialog):
     
     def _start_calibration(self):
         from .auto_calibration import AutoCalibrationDialog
-        dialog = AutoCalibrationDialog(self.config, self.logger, self, auto_start=True)
+        dialog = AutoCalibrationDialog(
+            self.config, self.logger, self, auto_start=True, audio_monitor=self.audio_monitor
+        )
         result = dialog.exec_()
         
         if result == QDialog.Accepted:
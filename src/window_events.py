@@ -0,0 +1,292 @@
+"""
+Foreground-window event sources for WindowTracker.
+
+A source yields ForegroundEvent(timestamp, process_name, title) whenever the
+foreground window (or its title) changes. WindowTracker credits the time
+between consecutive events to the app that was in front.
+
+- WinEventSource: SetWinEventHook (EVENT_SYSTEM_FOREGROUND + title changes
+  of the foreground process only), no polling; the default on Windows.
+- PollingSource: GetForegroundWindow every N seconds; fallback when the hook
+  can't be installed.
+- ScriptedSource: replays a synthetic event list (benchmarks, Linux).
+"""
+import ctypes
+import ctypes.wintypes
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Iterable, NamedTuple, Optional
+
+import psutil
+
+from src.process_cache import ProcessCache
+
+
+user32 = ctypes.windll.user32 if sys.platform == "win32" else None
+kernel32 = ctypes.windll.kernel32 if sys.platform == "win32" else None
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_NAMECHANGE = 0x800C
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+OBJID_WINDOW = 0
+WM_QUIT = 0x0012
+
+_WinEventProc = (
+    ctypes.WINFUNCTYPE(
+        None,
+        ctypes.wintypes.HANDLE,  # hWinEventHook
+        ctypes.wintypes.DWORD,   # event
+        ctypes.wintypes.HWND,    # hwnd
+        ctypes.wintypes.LONG,    # idObject
+        ctypes.wintypes.LONG,    # idChild
+        ctypes.wintypes.DWORD,   # idEventThread
+        ctypes.wintypes.DWORD,   # dwmsEventTime
+    )
+    if sys.platform == "win32" else None
+)
+
+
+class ForegroundEvent(NamedTuple):
+    timestamp: float                 # unix time
+    process_name: Optional[str]      # lowercased exe name, None = unknown/no window
+    title: Optional[str]
+
+
+def _get_window_info(hwnd, process_cache: Optional[ProcessCache] = None):
+    """Returns (process_name, window_title) of a window, or (None, None)."""
+    try:
+        if not hwnd:
+            return None, None
+
+        # Get window title
+        length = user32.GetWindowTextLengthW(hwnd)
+        if length == 0:
+            return None, None
+        buf = ctypes.create_unicode_buffer(length + 1)
+        user32.GetWindowTextW(hwnd, buf, length + 1)
+        title = buf.value
+
+        # Get process ID
+        pid = ctypes.wintypes.DWORD()
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+
+        # Get process name
+        if process_cache:
+            return process_cache.name(pid.value), title
+        try:
+            proc = psutil.Process(pid.value)
+            name = proc.name().lower()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None, title
+
+        return name, title
+    except Exception:
+        return None, None
+
+
+def _get_foreground_window_info(process_cache: Optional[ProcessCache] = None):
+    """Returns (process_name, window_title) of the foreground window, or (None, None)."""
+    try:
+        return _get_window_info(user32.GetForegroundWindow(), process_cache)
+    except Exception:
+        return None, None
+
+
+class ForegroundSource:
+    """Interface: open(), read(timeout) → ForegroundEvent or None on timeout,
+    close(). read() raises EOFError when a finite source runs out.
+    """
+
+    name = "base"
+    callbacks = 0  # times the source woke the process on its own (hook callbacks)
+
+    def open(self):
+        pass
+
+    def read(self, timeout: float) -> Optional[ForegroundEvent]:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PollingSource(ForegroundSource):
+    """Samples GetForegroundWindow every `interval` seconds (fallback)."""
+
+    name = "polling"
+
+    def __init__(self, interval: float = 5, process_cache: Optional[ProcessCache] = None):
+        self.interval = interval
+        self.process_cache = process_cache
+        self._closed = threading.Event()
+        self._next_poll = 0.0
+
+    def open(self):
+        self._closed.clear()
+        self._next_poll = time.monotonic()
+
+    def read(self, timeout: float) -> Optional[ForegroundEvent]:
+        delay = self._next_poll - time.monotonic()
+        if delay > timeout:
+            self._closed.wait(timeout)
+            return None
+        if delay > 0 and self._closed.wait(delay):
+            return None
+        self._next_poll = max(self._next_poll + self.interval, time.monotonic())
+        proc_name, title = _get_foreground_window_info(self.process_cache)
+        return ForegroundEvent(time.time(), proc_name, title)
+
+    def close(self):
+        self._closed.set()
+
+
+class WinEventSource(ForegroundSource):
+    """Foreground and title-change notifications via SetWinEventHook.
+
+    The hooks are out-of-context, so callbacks run on a dedicated thread that
+    pumps messages; events reach read() through a queue. The title-change hook
+    is scoped to the foreground window's process and moved on every
+    foreground switch, so caption updates elsewhere (tray clocks, other
+    browsers, chat apps in the background) don't wake the pump.
+    KidsPC's own windows (lock screen, strike popups) do raise foreground
+    events, reported with process_name None, so the app behind them stops
+    being credited.
+    """
+
+    name = "winevent"
+
+    def __init__(self, process_cache: Optional[ProcessCache] = None):
+        self.process_cache = process_cache
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id = 0
+        self._ready = threading.Event()
+        self._error: Optional[str] = None
+        self._last: tuple = (None, None)
+        self._callback = None  # keeps the ctypes callback alive
+        self._name_hook = None
+        self._name_hook_pid = None
+        self.callbacks = 0
+
+    def open(self):
+        if user32 is None:
+            raise OSError("WinEvent hooks require Windows")
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._pump, daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=5)
+        if self._error or not self._ready.is_set():
+            self.close()
+            raise OSError(self._error or "SetWinEventHook timed out")
+        self._emit(user32.GetForegroundWindow())
+
+    @staticmethod
+    def _window_pid(hwnd) -> int:
+        pid = ctypes.wintypes.DWORD()
+        if hwnd:
+            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        return pid.value
+
+    def _emit(self, hwnd):
+        if hwnd and self._window_pid(hwnd) == os.getpid():
+            proc_name, title = None, None
+        else:
+            proc_name, title = _get_window_info(hwnd, self.process_cache)
+        if (proc_name, title) != self._last:
+            self._last = (proc_name, title)
+            self._queue.put(ForegroundEvent(time.time(), proc_name, title))
+
+    def _hook_name_changes(self, hwnd) -> bool:
+        """(Re)installs the title-change hook for hwnd's process. Pump thread only."""
+        pid = self._window_pid(hwnd)
+        if not pid:
+            return self._name_hook is not None
+        if pid == self._name_hook_pid and self._name_hook:
+            return True
+        self._unhook_name_changes()
+        if pid == os.getpid():
+            return True  # our own titles are never tracked
+        hook = user32.SetWinEventHook(
+            EVENT_OBJECT_NAMECHANGE, EVENT_OBJECT_NAMECHANGE, 0, self._callback,
+            pid, 0, WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS,
+        )
+        if hook:
+            self._name_hook, self._name_hook_pid = hook, pid
+        return bool(hook)
+
+    def _unhook_name_changes(self):
+        if self._name_hook:
+            user32.UnhookWinEvent(ctypes.wintypes.HANDLE(self._name_hook))
+        self._name_hook = self._name_hook_pid = None
+
+    def _on_event(self, _hook, event, hwnd, id_object, id_child, _thread, _ms):
+        self.callbacks += 1
+        try:
+            if event == EVENT_OBJECT_NAMECHANGE:
+                # Any object of the foreground process lands here (tabs,
+                # child controls, its other windows); only the caption counts
+                if id_object != OBJID_WINDOW or id_child != 0 or hwnd != user32.GetForegroundWindow():
+                    return
+            else:
+                self._hook_name_changes(hwnd)
+            self._emit(hwnd)
+        except Exception as e:
+            print(f"WindowTracker hook error: {e}")
+
+    def _pump(self):
+        self._thread_id = kernel32.GetCurrentThreadId()
+        user32.SetWinEventHook.restype = ctypes.wintypes.HANDLE
+        self._callback = _WinEventProc(self._on_event)
+        # No SKIPOWNPROCESS here: switching to our own lock screen/popup must
+        # close the interval of the app that was in front
+        foreground_hook = user32.SetWinEventHook(
+            EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND, 0, self._callback, 0, 0,
+            WINEVENT_OUTOFCONTEXT,
+        )
+        try:
+            if not foreground_hook:
+                self._error = "SetWinEventHook failed"
+                return
+            self._hook_name_changes(user32.GetForegroundWindow())
+            self._ready.set()
+            msg = ctypes.wintypes.MSG()
+            while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            self._unhook_name_changes()
+            if foreground_hook:
+                user32.UnhookWinEvent(ctypes.wintypes.HANDLE(foreground_hook))
+            self._ready.set()
+
+    def read(self, timeout: float) -> Optional[ForegroundEvent]:
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        if self._thread and self._thread.is_alive():
+            user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            self._thread.join(timeout=2)
+        self._thread = None
+        self._queue.put(None)  # wakes a blocked read()
+
+
+class ScriptedSource(ForegroundSource):
+    """Replays (timestamp, process_name, title) tuples in order, without waiting."""
+
+    name = "scripted"
+
+    def __init__(self, events: Iterable[tuple]):
+        self._events = iter(events)
+
+    def read(self, timeout: float) -> Optional[ForegroundEvent]:
+        try:
+            return ForegroundEvent(*next(self._events))
+        except StopIteration:
+            raise EOFError from None
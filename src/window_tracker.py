@@ -1,16 +1,22 @@
 """
 Rastreia a janela ativa (foreground) do Windows.
 Registra tempo por aplicativo e extrai domínios de navegadores pelo título da janela.
+
+Orientado a eventos: cada troca de janela (ou de título) vinda de um
+ForegroundSource (src/window_events.py) fecha o intervalo anterior, que é
+creditado inteiro ao app que estava na frente.
 """
-import ctypes
-import ctypes.wintypes
 import threading
 import time
 import re
-from datetime import date
+from datetime import date, datetime, time as dtime
 from collections import defaultdict
+from typing import Optional
 
-import psutil
+from src.process_cache import ProcessCache
+from src.window_events import (
+    ForegroundEvent, ForegroundSource, PollingSource, WinEventSource,
+)
 
 
 # Browsers: process name → title pattern to extract domain
@@ -55,40 +61,6 @@ _SITE_FROM_TITLE = {
 }
 
 
-user32 = ctypes.windll.user32
-
-
-def _get_foreground_window_info():
-    """Returns (process_name, window_title) of the foreground window, or (None, None)."""
-    try:
-        hwnd = user32.GetForegroundWindow()
-        if not hwnd:
-            return None, None
-
-        # Get window title
-        length = user32.GetWindowTextLengthW(hwnd)
-        if length == 0:
-            return None, None
-        buf = ctypes.create_unicode_buffer(length + 1)
-        user32.GetWindowTextW(hwnd, buf, length + 1)
-        title = buf.value
-
-        # Get process ID
-        pid = ctypes.wintypes.DWORD()
-        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
-
-        # Get process name
-        try:
-            proc = psutil.Process(pid.value)
-            name = proc.name().lower()
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            return None, title
-
-        return name, title
-    except Exception:
-        return None, None
-
-
 def _extract_domain_from_title(title: str) -> str | None:
     """Try to extract a domain from a browser window title."""
     if not title:
@@ -158,24 +130,50 @@ _IGNORED_PROCESSES = {
 }
 
 
+# The open interval is credited at least this often, so sync reads mid-dwell
+FLUSH_SECONDS = 30
+# A read() that took this much longer than FLUSH_SECONDS means the PC slept:
+# the gap is dropped instead of credited to the app that was in front
+SUSPEND_SLACK_SECONDS = 10
+
+
 class WindowTracker:
-    """Tracks foreground window, aggregating time per app and extracting browser domains."""
+    """Tracks foreground window, aggregating time per app and extracting browser domains.
+
+    Events come from `source`; by default WinEventSource (hooks), falling back
+    to PollingSource(poll_interval) when the hooks can't be installed.
+    Process names are resolved through `process_cache` (shared with AppBlocker).
+    """
 
-    def __init__(self, poll_interval: int = 5):
+    def __init__(self, poll_interval: int = 5, source: Optional[ForegroundSource] = None,
+                 process_cache: Optional[ProcessCache] = None):
         self._poll_interval = poll_interval
+        self._source = source
+        self._process_cache = process_cache or ProcessCache()
+        self._active_source: Optional[ForegroundSource] = None
+        self._stats_source: Optional[ForegroundSource] = None  # kept after stop for get_stats
         self._running = threading.Event()
         self._thread = None
         self._lock = threading.Lock()
 
+        # Foreground app being timed, and the instant it was last credited up to
+        self._current: tuple = (None, None)                        # (process_name, title)
+        self._since: float | None = None
+        self._stats = {"source": None, "events": 0, "wakeups": 0}
+
         # Aggregated data for today
         self._today = date.today()
-        self._app_seconds: dict[str, int] = defaultdict(int)      # app_name → seconds
+        self._app_seconds: dict[str, float] = defaultdict(float)  # app_name → seconds
         self._app_display: dict[str, str] = {}                     # app_name → display_name
-        self._site_seconds: dict[str, int] = defaultdict(int)      # domain → seconds
+        self._site_seconds: dict[str, float] = defaultdict(float)  # domain → seconds
         self._site_titles: dict[str, str] = {}                     # domain → last title
         self._site_visits: dict[str, int] = defaultdict(int)       # domain → visit count
         self._last_domain: str | None = None
 
+        # Dirty tracking: last minutes value handed to the durable outbox per app.
+        # An app is "changed" when its current minutes differ from that value.
+        self._synced_app_minutes: dict[str, int] = {}              # app_name → minutes
+
     def start(self):
         if self._thread and self._thread.is_alive():
             return
@@ -185,11 +183,19 @@ class WindowTracker:
 
     def stop(self):
         self._running.clear()
+        source = self._active_source
+        if source:
+            source.close()  # wakes a blocked read()
         if self._thread:
             self._thread.join(timeout=3)
 
-    def _reset_if_new_day(self):
-        today = date.today()
+    def run(self):
+        """Runs on the current thread until the source ends or stop() (replay/benchmark)."""
+        self._running.set()
+        self._track_loop()
+
+    def _reset_if_new_day(self, now: float):
+        today = date.fromtimestamp(now)
         if today != self._today:
             with self._lock:
                 self._today = today
@@ -199,51 +205,125 @@ class WindowTracker:
                 self._site_titles.clear()
                 self._site_visits.clear()
                 self._last_domain = None
+                self._synced_app_minutes.clear()
+            # Only the part of the open interval after midnight counts for today
+            if self._since is not None:
+                self._since = max(self._since, datetime.combine(today, dtime()).timestamp())
+
+    def _open_source(self) -> ForegroundSource:
+        if self._source:
+            self._source.open()
+            return self._source
+        try:
+            source = WinEventSource(self._process_cache)
+            source.open()
+            return source
+        except OSError as e:
+            print(f"WindowTracker: WinEvent hooks unavailable ({e}), polling every {self._poll_interval}s")
+        source = PollingSource(self._poll_interval, self._process_cache)
+        source.open()
+        return source
 
     def _track_loop(self):
-        while self._running.is_set():
-            try:
-                self._reset_if_new_day()
-                proc_name, title = _get_foreground_window_info()
-
-                if proc_name and proc_name not in _IGNORED_PROCESSES:
-                    with self._lock:
-                        self._app_seconds[proc_name] += self._poll_interval
-                        if proc_name not in self._app_display:
-                            self._app_display[proc_name] = _friendly_app_name(proc_name)
-
-                        # Browser domain extraction
-                        if proc_name in BROWSER_PROCESSES and title:
-                            domain = _extract_domain_from_title(title)
-                            if domain:
-                                self._site_seconds[domain] += self._poll_interval
-                                # Strip browser suffix for cleaner title
-                                clean_title = _TITLE_SEPARATOR_RE.sub("", title).strip()
-                                self._site_titles[domain] = clean_title[:200]
-
-                                if domain != self._last_domain:
-                                    self._site_visits[domain] += 1
-                                    self._last_domain = domain
-                            else:
-                                self._last_domain = None
-                        else:
-                            self._last_domain = None
-
-            except Exception as e:
-                print(f"WindowTracker error: {e}")
-
-            # Interruptible sleep
-            for _ in range(self._poll_interval * 2):
-                if not self._running.is_set():
+        source = None
+        ended = False
+        try:
+            source = self._open_source()
+            self._active_source = self._stats_source = source
+            self._stats["source"] = source.name
+            while self._running.is_set():
+                before = time.time()
+                try:
+                    event = source.read(FLUSH_SECONDS)
+                except EOFError:
+                    ended = True  # end of a scripted stream
                     break
-                time.sleep(0.5)
+                try:
+                    self._stats["wakeups"] += 1
+                    if time.time() - before > FLUSH_SECONDS + SUSPEND_SLACK_SECONDS:
+                        self._since = None
+                    now = event.timestamp if event else time.time()
+                    self._reset_if_new_day(now)
+                    if event:
+                        self._on_event(event)
+                    else:
+                        self._advance(now)
+                except Exception as e:
+                    print(f"WindowTracker error: {e}")
+        except Exception as e:
+            print(f"WindowTracker error: {e}")
+        finally:
+            if source:
+                if not ended:
+                    self._advance(time.time())
+                source.close()
+            self._active_source = None
+            self._since = None
+            self._running.clear()
+
+    def _advance(self, now: float):
+        """Credits the current app with the time elapsed since the last credit."""
+        if self._since is not None and now > self._since:
+            self._credit(*self._current, now - self._since)
+        self._since = now
+
+    def _on_event(self, event: ForegroundEvent):
+        self._stats["events"] += 1
+        self._advance(event.timestamp)
+        proc_name, title = event.process_name, event.title
+        self._current = (proc_name, title)
+
+        # A visit starts whenever the browser in front switches domain
+        domain = None
+        if proc_name in BROWSER_PROCESSES and title:
+            domain = _extract_domain_from_title(title)
+        with self._lock:
+            if domain and domain != self._last_domain:
+                self._site_visits[domain] += 1
+            self._last_domain = domain
 
-    def get_app_usage(self) -> list[dict]:
-        """Returns list of {app_name, display_name, minutes} for today."""
+    def _credit(self, proc_name: str | None, title: str | None, seconds: float):
+        if not proc_name or proc_name in _IGNORED_PROCESSES:
+            return
+        with self._lock:
+            self._app_seconds[proc_name] += seconds
+            if proc_name not in self._app_display:
+                self._app_display[proc_name] = _friendly_app_name(proc_name)
+
+            # Browser domain extraction
+            if proc_name in BROWSER_PROCESSES and title:
+                domain = _extract_domain_from_title(title)
+                if domain:
+                    self._site_seconds[domain] += seconds
+                    # Strip browser suffix for cleaner title
+                    clean_title = _TITLE_SEPARATOR_RE.sub("", title).strip()
+                    self._site_titles[domain] = clean_title[:200]
+
+    def get_stats(self) -> dict:
+        """Event source in use, events received and wakeups.
+
+        "wakeups" counts every time a tracker thread ran: iterations of the
+        tracking loop plus hook callbacks on the pump thread, including the
+        ones that were filtered out ("callbacks").
+        """
+        stats = dict(self._stats)
+        source = self._stats_source
+        stats["callbacks"] = source.callbacks if source else 0
+        stats["wakeups"] += stats["callbacks"]
+        return stats
+
+    def get_app_usage(self, changed_only: bool = False) -> list[dict]:
+        """Returns list of {app_name, display_name, minutes} for today.
+
+        With changed_only=True, only apps whose minutes differ from the last
+        value passed to mark_app_usage_synced() are returned.
+        """
         with self._lock:
             result = []
             for app_name, seconds in self._app_seconds.items():
-                minutes = seconds // 60
+                minutes = int(seconds // 60)
+                if changed_only and self._synced_app_minutes.get(app_name) == minutes:
+                    continue
                 if minutes > 0:
                     result.append({
                         "app_name": app_name,
@@ -261,6 +341,17 @@ class WindowTracker:
                     "domain": domain,
                     "title": self._site_titles.get(domain, ""),
                     "visit_count": self._site_visits.get(domain, 1),
-                    "total_seconds": seconds,
+                    "total_seconds": int(seconds),
                 })
             return sorted(result, key=lambda x: x["total_seconds"], reverse=True)
+
+    def mark_app_usage_synced(self, rows: list[dict]):
+        """Records the minutes queued in the outbox for each app.
+
+        Called once the rows are in the on-disk outbox, not on server ack:
+        the outbox keeps them until the server confirms (it is only cleared
+        on unpair, when the data no longer matters).
+        """
+        with self._lock:
+            for row in rows:
+                self._synced_app_minutes[row["app_name"]] = row["minutes"]
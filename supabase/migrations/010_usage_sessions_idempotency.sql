@@ -0,0 +1,23 @@
+-- Idempotency key for usage_sessions.
+-- The desktop sends pending sessions as one bulk upsert per sync cycle with
+-- on_conflict=(pc_id, started_at) + ignore-duplicates, so a retry after a lost
+-- response never creates duplicate rows.
+
+-- Remove duplicates created by earlier per-row retries. usage_sessions has
+-- no insert timestamp and its UUID ids are random, so "first row" can't be
+-- told apart; retries resend the same session, so keep the most complete
+-- copy (latest ended_at, then longest duration), with id as a stable tie-break.
+DELETE FROM usage_sessions
+WHERE id IN (
+    SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (
+            PARTITION BY pc_id, started_at
+            ORDER BY ended_at DESC NULLS LAST, duration_minutes DESC, id
+        ) AS rn
+        FROM usage_sessions
+    ) d
+    WHERE d.rn > 1
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_usage_sessions_pc_started
+  ON usage_sessions(pc_id, started_at);
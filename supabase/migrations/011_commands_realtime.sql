@@ -0,0 +1,15 @@
+-- Realtime push for commands.
+-- The desktop subscribes to INSERTs on commands filtered by its pc_id, so a
+-- parent's lock/add_time lands immediately instead of on the next poll.
+-- Realtime applies the existing commands_select RLS policy (jwt_pc_id()),
+-- so each device only receives its own commands.
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_publication_tables
+        WHERE pubname = 'supabase_realtime' AND schemaname = 'public' AND tablename = 'commands'
+    ) THEN
+        ALTER PUBLICATION supabase_realtime ADD TABLE commands;
+    END IF;
+END $$;
@@ -0,0 +1,39 @@
+-- Config revision per PC.
+-- pcs.config_revision is bumped whenever the PC's pc_settings, blocked_apps
+-- or blocked_sites rows change. The desktop reads it from the heartbeat
+-- reply (pcs update returns the row) and only re-selects settings and rules
+-- when the revision moved since the last one it applied.
+
+ALTER TABLE pcs ADD COLUMN IF NOT EXISTS config_revision bigint NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION public.bump_pc_config_revision() RETURNS trigger
+  LANGUAGE plpgsql
+  SECURITY DEFINER
+  SET search_path = ''
+  AS $$
+DECLARE
+    target uuid;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        target := OLD.pc_id;
+    ELSE
+        target := NEW.pc_id;
+    END IF;
+    UPDATE public.pcs SET config_revision = config_revision + 1 WHERE id = target;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS trg_pc_settings_revision ON pc_settings;
+CREATE TRIGGER trg_pc_settings_revision
+  AFTER INSERT OR UPDATE OR DELETE ON pc_settings
+  FOR EACH ROW EXECUTE FUNCTION public.bump_pc_config_revision();
+
+DROP TRIGGER IF EXISTS trg_blocked_apps_revision ON blocked_apps;
+CREATE TRIGGER trg_blocked_apps_revision
+  AFTER INSERT OR UPDATE OR DELETE ON blocked_apps
+  FOR EACH ROW EXECUTE FUNCTION public.bump_pc_config_revision();
+
+DROP TRIGGER IF EXISTS trg_blocked_sites_revision ON blocked_sites;
+CREATE TRIGGER trg_blocked_sites_revision
+  AFTER INSERT OR UPDATE OR DELETE ON blocked_sites
+  FOR EACH ROW EXECUTE FUNCTION public.bump_pc_config_revision();
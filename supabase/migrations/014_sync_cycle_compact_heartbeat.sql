@@ -0,0 +1,133 @@
+-- Compact heartbeat support for sync_cycle.
+-- The desktop now sends only the pcs columns that changed since the last
+-- acknowledged heartbeat, and heartbeat = null when nothing changed and the
+-- keepalive is not due. In that case the row is only read (found /
+-- config_revision), not rewritten, so idle PCs stop churning row versions.
+-- is_online / app_running / shutdown_type are now written only when sent.
+
+CREATE OR REPLACE FUNCTION public.sync_cycle(payload jsonb) RETURNS jsonb
+  LANGUAGE plpgsql
+  SECURITY INVOKER
+  SET search_path = ''
+  AS $$
+DECLARE
+    v_pc_id uuid := public.jwt_pc_id();
+    v_pc public.pcs%ROWTYPE;
+    hb jsonb := COALESCE(payload->'heartbeat', '{}'::jsonb);
+    result jsonb;
+BEGIN
+    IF v_pc_id IS NULL THEN
+        RAISE EXCEPTION 'sync_cycle: JWT sem pc_id';
+    END IF;
+
+    IF payload->'heartbeat' IS NULL OR jsonb_typeof(payload->'heartbeat') = 'null' THEN
+        -- Nothing changed and keepalive not due: read the row, don't write it
+        SELECT * INTO v_pc FROM public.pcs p
+        WHERE p.id = v_pc_id AND p.deleted_at IS NULL;
+    ELSE
+        -- Compact heartbeat: only keys present in the payload are written
+        UPDATE public.pcs p SET
+            last_heartbeat = COALESCE((hb->>'last_heartbeat')::timestamptz, now()),
+            is_online = CASE WHEN hb ? 'is_online' THEN (hb->>'is_online')::boolean ELSE p.is_online END,
+            app_running = CASE WHEN hb ? 'app_running' THEN (hb->>'app_running')::boolean ELSE p.app_running END,
+            shutdown_type = CASE WHEN hb ? 'shutdown_type' THEN hb->>'shutdown_type' ELSE p.shutdown_type END,
+            is_locked = CASE WHEN hb ? 'is_locked' THEN (hb->>'is_locked')::boolean ELSE p.is_locked END,
+            responsible_mode = CASE WHEN hb ? 'responsible_mode' THEN (hb->>'responsible_mode')::boolean ELSE p.responsible_mode END,
+            usage_today_minutes = CASE WHEN hb ? 'usage_today_minutes' THEN (hb->>'usage_today_minutes')::integer ELSE p.usage_today_minutes END,
+            effective_limit_minutes = CASE WHEN hb ? 'effective_limit_minutes' THEN (hb->>'effective_limit_minutes')::integer ELSE p.effective_limit_minutes END,
+            current_noise_db = CASE WHEN hb ? 'current_noise_db' THEN (hb->>'current_noise_db')::real ELSE p.current_noise_db END,
+            strikes = CASE WHEN hb ? 'strikes' THEN (hb->>'strikes')::integer ELSE p.strikes END,
+            last_activity = CASE WHEN hb ? 'last_activity' THEN (hb->>'last_activity')::timestamptz ELSE p.last_activity END,
+            app_version = CASE WHEN hb ? 'app_version' THEN hb->>'app_version' ELSE p.app_version END
+        WHERE p.id = v_pc_id AND p.deleted_at IS NULL
+        RETURNING * INTO v_pc;
+    END IF;
+
+    -- Deleted / soft-deleted PC: the desktop treats this as orphaned
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('found', false);
+    END IF;
+
+    INSERT INTO public.usage_sessions (user_id, pc_id, started_at, ended_at, duration_minutes)
+    SELECT v_pc.user_id, v_pc_id,
+           (r->>'started_at')::timestamptz,
+           (r->>'ended_at')::timestamptz,
+           COALESCE((r->>'duration_minutes')::integer, 0)
+    FROM jsonb_array_elements(COALESCE(payload->'usage_sessions', '[]'::jsonb)) r
+    ON CONFLICT (pc_id, started_at) DO NOTHING;
+
+    INSERT INTO public.daily_usage (user_id, pc_id, date, total_minutes, sessions_count)
+    SELECT v_pc.user_id, v_pc_id,
+           (r->>'date')::date,
+           COALESCE((r->>'total_minutes')::integer, 0),
+           COALESCE((r->>'sessions_count')::integer, 0)
+    FROM jsonb_array_elements(COALESCE(payload->'daily_usage', '[]'::jsonb)) r
+    ON CONFLICT (pc_id, date) DO UPDATE SET
+        total_minutes = EXCLUDED.total_minutes,
+        sessions_count = EXCLUDED.sessions_count;
+
+    INSERT INTO public.app_usage (user_id, pc_id, date, app_name, display_name, minutes, updated_at)
+    SELECT v_pc.user_id, v_pc_id,
+           (r->>'date')::date,
+           r->>'app_name',
+           r->>'display_name',
+           COALESCE((r->>'minutes')::integer, 0),
+           COALESCE((r->>'updated_at')::timestamptz, now())
+    FROM jsonb_array_elements(COALESCE(payload->'app_usage', '[]'::jsonb)) r
+    ON CONFLICT (pc_id, date, app_name) DO UPDATE SET
+        display_name = EXCLUDED.display_name,
+        minutes = EXCLUDED.minutes,
+        updated_at = EXCLUDED.updated_at;
+
+    INSERT INTO public.site_visits (user_id, pc_id, date, domain, title, visit_count, total_seconds, source, updated_at)
+    SELECT v_pc.user_id, v_pc_id,
+           (r->>'date')::date,
+           r->>'domain',
+           r->>'title',
+           COALESCE((r->>'visit_count')::integer, 1),
+           COALESCE((r->>'total_seconds')::integer, 0),
+           COALESCE(r->>'source', 'window_title'),
+           COALESCE((r->>'updated_at')::timestamptz, now())
+    FROM jsonb_array_elements(COALESCE(payload->'site_visits', '[]'::jsonb)) r
+    ON CONFLICT (pc_id, date, domain) DO UPDATE SET
+        title = EXCLUDED.title,
+        visit_count = EXCLUDED.visit_count,
+        total_seconds = EXCLUDED.total_seconds,
+        source = EXCLUDED.source,
+        updated_at = EXCLUDED.updated_at;
+
+    INSERT INTO public.events (user_id, pc_id, timestamp, type, description, noise_db)
+    SELECT v_pc.user_id, v_pc_id,
+           (r->>'timestamp')::timestamptz,
+           r->>'type',
+           r->>'description',
+           COALESCE((r->>'noise_db')::real, 0)
+    FROM jsonb_array_elements(COALESCE(payload->'events', '[]'::jsonb)) r
+    ON CONFLICT (pc_id, timestamp, type) DO NOTHING;
+
+    result := jsonb_build_object(
+        'found', true,
+        'config_revision', v_pc.config_revision,
+        'commands', COALESCE((
+            SELECT jsonb_agg(to_jsonb(c) ORDER BY c.created_at)
+            FROM public.commands c
+            WHERE c.pc_id = v_pc_id AND c.status = 'pending'
+        ), '[]'::jsonb)
+    );
+
+    IF (payload->>'config_revision')::bigint IS DISTINCT FROM v_pc.config_revision THEN
+        result := result || jsonb_build_object(
+            'settings', (SELECT to_jsonb(s) FROM public.pc_settings s WHERE s.pc_id = v_pc_id),
+            'blocked_apps', COALESCE((
+                SELECT jsonb_agg(to_jsonb(a)) FROM public.blocked_apps a WHERE a.pc_id = v_pc_id
+            ), '[]'::jsonb),
+            'blocked_sites', COALESCE((
+                SELECT jsonb_agg(to_jsonb(b)) FROM public.blocked_sites b WHERE b.pc_id = v_pc_id
+            ), '[]'::jsonb)
+        );
+    END IF;
+
+    RETURN result;
+END $$;
+
+GRANT EXECUTE ON FUNCTION public.sync_cycle(jsonb) TO anon, authenticated;